@@ -0,0 +1,214 @@
+"""This module implements an AggregateStack data structure.
+
+The AggregateStack generalizes the MinStack: next to every item it keeps
+the aggregate of the items from the bottom of the stack up to that item,
+for any associative operation. Pushing combines one aggregate and popping
+discards one, so the aggregate of the whole stack is always at the top.
+
+For a selective operation, one that always returns one of its arguments
+like min and max, an aggregate is only kept when an item changes it, as
+the classic MinStack does.
+
+    Usage:
+
+    >>> max_stack = running_max()
+    >>> for n in [3, 9, 4]:
+    ...     max_stack.push(n)
+    >>> max_stack.aggregate()
+    9
+    >>> max_stack.pop()
+    4
+    >>> max_stack.pop()
+    9
+    >>> max_stack.aggregate()
+    3
+"""
+import operator
+from typing import Any, Callable, Generic, TypeVar
+
+from stack import Stack
+
+T = TypeVar("T")
+
+
+class AggregateStack(Generic[T]):
+    """Represents a stack that maintains an aggregate of its items.
+
+    The provided operation must be associative, e.g. min, max, addition
+    or gcd. Items are mapped by `key` before they are aggregated.
+    """
+
+    def __init__(
+        self,
+        op: Callable[[Any, Any], Any],
+        identity: Any = None,
+        key: Callable[[T], Any] | None = None,
+        selective: bool = False,
+    ):
+        """Initializes a new AggregateStack instance.
+
+        This is a constant time operation.
+
+        :param op: The associative operation that combines two values.
+        :param identity: The aggregate of an empty stack. If None, the
+        aggregate of an empty stack is None and the first item's value is
+        its own aggregate.
+        :param key: Maps an item to the value to aggregate, or None to
+        aggregate the items themselves.
+        :param selective: True if `op` always returns one of its arguments,
+        to only keep the aggregates that differ from the one below.
+        """
+        self._stack: Stack[T] = Stack()
+        self._aggregates: Stack[Any] = Stack()
+        self._op = op
+        self._identity = identity
+        self._key = key
+        self._selective = selective
+
+    def push(self, item: T) -> None:
+        """Pushes the `item` onto the stack.
+
+        This is a constant time operation.
+
+        :param item: The item to push onto the stack.
+        """
+        value = self._key(item) if self._key else item
+        if self._stack.is_empty():
+            if self._identity is not None:
+                value = self._op(self._identity, value)
+            self._aggregates.push(value)
+        else:
+            aggregate = self._op(self._aggregates.top(), value)
+            # A selective aggregate only changes when the value is selected
+            if not self._selective or aggregate == value:
+                self._aggregates.push(aggregate)
+        self._stack.push(item)
+
+    def pop(self) -> T | None:
+        """Removes the top item from the stack.
+
+        This is a constant time operation.
+
+        :return: The removed item or None if the stack is empty.
+        """
+        if not self._selective:
+            self._aggregates.pop()
+            return self._stack.pop()
+
+        item = self._stack.pop()
+        if self._stack.is_empty():
+            # The bottom item always has its own aggregate
+            self._aggregates.pop()
+        elif (self._key(item) if self._key else item) == self._aggregates.top():
+            self._aggregates.pop()
+        return item
+
+    def top(self) -> T | None:
+        """Returns the item at the top of the stack.
+
+        This is a constant time operation.
+
+        The item is not removed from the stack.
+        """
+        return self._stack.top()
+
+    def aggregate(self) -> Any:
+        """Returns the aggregate of all items in the stack.
+
+        This is a constant time operation.
+
+        :return: The aggregate, or the identity if the stack is empty.
+        """
+        if self._stack.is_empty():
+            return self._identity
+        return self._aggregates.top()
+
+    def is_empty(self) -> bool:
+        """Returns True if the stack is empty, false otherwise.
+
+        This is a constant time operation.
+        """
+        return self._stack.is_empty()
+
+    def __len__(self) -> int:
+        """Returns the length of the stack.
+
+        This is a constant time operation.
+        """
+        return len(self._stack)
+
+
+def running_min(key: Callable[[T], Any] | None = None) -> AggregateStack[T]:
+    """Returns an AggregateStack that tracks the minimum value."""
+    return AggregateStack(min, key=key, selective=True)
+
+
+def running_max(key: Callable[[T], Any] | None = None) -> AggregateStack[T]:
+    """Returns an AggregateStack that tracks the maximum value."""
+    return AggregateStack(max, key=key, selective=True)
+
+
+def running_sum(key: Callable[[T], Any] | None = None) -> AggregateStack[T]:
+    """Returns an AggregateStack that tracks the sum of the values."""
+    return AggregateStack(operator.add, identity=0, key=key)
+
+
+def running_argmin(key: Callable[[T], Any] | None = None) -> AggregateStack[T]:
+    """Returns an AggregateStack that tracks the minimum and its item.
+
+    The aggregate is a (minimum value, item) pair; of equal values, the
+    item closest to the bottom of the stack wins.
+    """
+    value = key or (lambda item: item)
+    return AggregateStack(
+        lambda low, candidate: candidate if candidate[0] < low[0] else low,
+        key=lambda item: (value(item), item),
+    )
+
+
+if __name__ == "__main__":
+    import math
+
+    min_stack: AggregateStack[int] = running_min()
+    assert min_stack.aggregate() is None
+    assert min_stack.pop() is None
+    for n in [2, 15, 1, -50, 1000]:
+        min_stack.push(n)
+    assert min_stack.aggregate() == -50
+    assert min_stack.top() == 1000
+    assert len(min_stack) == 5
+    min_stack.pop()
+    min_stack.pop()
+    assert min_stack.aggregate() == 1
+
+    sum_stack: AggregateStack[int] = running_sum()
+    assert sum_stack.aggregate() == 0
+    for n in [1, 2, 3]:
+        sum_stack.push(n)
+    assert sum_stack.aggregate() == 6
+    sum_stack.pop()
+    assert sum_stack.aggregate() == 3
+
+    gcd_stack: AggregateStack[int] = AggregateStack(math.gcd, identity=0)
+    for n in [12, 18, 8]:
+        gcd_stack.push(n)
+    assert gcd_stack.aggregate() == 2
+    gcd_stack.pop()
+    assert gcd_stack.aggregate() == 6
+
+    words: AggregateStack[str] = running_max(key=len)
+    for word in ["a", "abc", "ab"]:
+        words.push(word)
+    assert words.aggregate() == 3
+
+    argmin_stack: AggregateStack[str] = running_argmin(key=len)
+    assert argmin_stack.aggregate() is None
+    for word in ["abc", "x", "yz", "q"]:
+        argmin_stack.push(word)
+    assert argmin_stack.aggregate() == (1, "x")
+    argmin_stack.pop()
+    argmin_stack.pop()
+    argmin_stack.pop()
+    assert argmin_stack.aggregate() == (3, "abc")
+    argmin_stack.pop()
+    assert argmin_stack.is_empty() is True
@@ -0,0 +1,330 @@
+"""This module implements a singly linked list stored in parallel arrays.
+
+Instead of one node object per value, the list keeps the values and the
+index of each value's successor in two arrays, the arena. A node is an
+index into the arena. Slots of deleted nodes are chained into a free list
+and reused by later appends and prepends, so the arena only grows when
+every slot is in use.
+
+Without per-node objects, a node costs a slot in each array. A typed list
+also stores its values unboxed in an `array.array`.
+
+    Usage:
+
+    >>> linked_list = ArenaLinkedList([1, 2, 3])
+    >>> linked_list.prepend(0)
+    >>> linked_list.delete(2)
+    True
+    >>> print(linked_list)
+    0->1->3->None
+    >>> linked_list[2], linked_list.mid_point()
+    (3, 1)
+"""
+from array import array
+from typing import Generic, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# The index that marks the end of the list or of the free list
+_NIL = -1
+
+# The typecode of the next indices, which limits a list to 2**31 - 1 slots
+_INDEX_TYPECODE = "i"
+
+
+class ArenaLinkedList(Generic[T]):
+    # Time: O(N), Space: O(N)
+    def __init__(self, x: list[T] | None = None, typecode: str | None = None) -> None:
+        self._typecode: str | None = typecode
+        self._values: list[T | None] | array = array(typecode) if typecode else []
+        # The index of the next node of each node
+        self._next: array = array(_INDEX_TYPECODE)
+        self._head: int = _NIL
+        self._tail: int = _NIL
+        # The most recently freed slot, chained through _next
+        self._free: int = _NIL
+        self._size: int = 0
+
+        if x:
+            self._init_from_list(x)
+
+    # Time: Θ(N), Space: Θ(N)
+    def _init_from_list(self, x: list[T]) -> None:
+        if not x:
+            raise ValueError("non-empty list required")
+
+        # Replace the arena with the source list, each node followed by
+        # the node in the next slot
+        n = len(x)
+        self._values = array(self._typecode, x) if self._typecode else list(x)
+        self._next = array(_INDEX_TYPECODE, range(1, n + 1))
+        self._next[-1] = _NIL
+        self._head = 0
+        self._tail = n - 1
+        self._free = _NIL
+        self._size = n
+
+    # Time: Θ(1), Space: Θ(1) amortized
+    def _allocate(self, value: T, next: int) -> int:
+        if self._free == _NIL:
+            self._values.append(value)  # type: ignore
+            self._next.append(next)
+            return len(self._next) - 1
+        # Reuse the most recently freed slot
+        index = self._free
+        self._free = self._next[index]
+        self._values[index] = value
+        self._next[index] = next
+        return index
+
+    # Time: Θ(1), Space: Θ(1)
+    def _release(self, index: int) -> None:
+        if not self._typecode:
+            # Release the value so that it can be reclaimed right away
+            self._values[index] = None
+        self._next[index] = self._free
+        self._free = index
+
+    # Time: Θ(1), Space: Θ(1)
+    def prepend(self, value: T) -> None:
+        self._head = self._allocate(value, self._head)
+        if self._tail == _NIL:
+            self._tail = self._head
+        self._size += 1
+
+    # Time: Θ(1), Space: Θ(1)
+    def append(self, value: T) -> None:
+        new_tail = self._allocate(value, _NIL)
+
+        if self.is_empty():
+            self._head = new_tail
+        else:
+            # Connect the previous tail node to the new tail node
+            self._next[self._tail] = new_tail
+        self._tail = new_tail
+        self._size += 1
+
+    # Values, not nodes, are returned: the arena has no node objects
+    # Time: Θ(1), Space: Θ(1)
+    def head(self) -> T | None:
+        if self.is_empty():
+            return None
+        return self._values[self._head]
+
+    # Time: Θ(1), Space: Θ(1)
+    def tail(self) -> T | None:
+        if self.is_empty():
+            return None
+        return self._values[self._tail]
+
+    # Time: O(N), Space: Θ(1)
+    def delete(self, value) -> bool:
+        previous = _NIL
+        cursor = self._head
+        while cursor != _NIL:
+            if self._values[cursor] == value:
+                following = self._next[cursor]
+                if previous == _NIL:
+                    self._head = following
+                else:
+                    self._next[previous] = following
+                if cursor == self._tail:
+                    self._tail = previous
+                self._release(cursor)
+                self._size -= 1
+                return True
+            previous = cursor
+            cursor = self._next[cursor]
+        return False
+
+    # Time: Θ(1), Space: Θ(1)
+    def is_empty(self) -> bool:
+        return self._size == 0
+
+    # Time: Θ(1), Space: Θ(1)
+    def delete_head(self) -> bool:
+        if self.is_empty():
+            return False
+
+        old_head = self._head
+        self._head = self._next[old_head]
+        if self._head == _NIL:
+            self._tail = _NIL
+        self._release(old_head)
+        self._size -= 1
+        return True
+
+    # Time: O(N), Space: Θ(1)
+    def delete_tail(self) -> bool:
+        if self.is_empty():
+            return False
+        if self._size == 1:
+            return self.delete_head()
+
+        # Find the node that precedes the tail node
+        previous = self._head
+        while self._next[previous] != self._tail:
+            previous = self._next[previous]
+        self._release(self._tail)
+        self._next[previous] = _NIL
+        self._tail = previous
+        self._size -= 1
+        return True
+
+    # Time: Θ(N), Space: Θ(1)
+    def reverse(self) -> None:
+        # Point each node's next index at its predecessor
+        next_indices = self._next
+        previous = _NIL
+        cursor = self._head
+        while cursor != _NIL:
+            following = next_indices[cursor]
+            next_indices[cursor] = previous
+            previous = cursor
+            cursor = following
+        self._head, self._tail = self._tail, self._head
+
+    # Time: O(N), Space: Θ(1)
+    def mid_point(self) -> T | None:
+        if self.is_empty():
+            return None
+        # The same node as LinkedList.mid_point: the first of two middles
+        return self[(self._size - 1) // 2]
+
+    # Time: O(N), Space: Θ(1)
+    def __getitem__(self, index: int) -> T | None:
+        if index < 0 or index > len(self) - 1:
+            return None
+
+        cursor = self._head
+        for _ in range(index):
+            cursor = self._next[cursor]
+        return self._values[cursor]
+
+    # Time: O(N), Space: Θ(1)
+    def __contains__(self, value) -> bool:
+        return any(self._values[index] == value for index in self._indices())
+
+    # Time: Θ(1), Space: Θ(1)
+    def __len__(self) -> int:
+        return self._size
+
+    # Time: Θ(N), Space: Θ(1)
+    def __iter__(self) -> Iterator[T]:
+        for index in self._indices():
+            yield self._values[index]  # type: ignore
+
+    # Time: Θ(N), Space: Θ(1)
+    def _indices(self) -> Iterator[int]:
+        next_indices = self._next
+        cursor = self._head
+        while cursor != _NIL:
+            yield cursor
+            cursor = next_indices[cursor]
+
+    # Time: Θ(N), Space: Θ(N)
+    def __str__(self) -> str:
+        string_values = [str(value) for value in self]
+        string_values.append(str(None))
+        return "->".join(string_values)
+
+
+if __name__ == "__main__":
+    numbers: list[int] = [n for n in range(1, 11)]
+
+    for typecode in (None, "q"):
+        linked_list: ArenaLinkedList[int] = ArenaLinkedList(numbers, typecode)
+        assert str(linked_list) == "->".join(map(str, numbers + [None]))
+        assert len(linked_list) == 10
+        assert (linked_list.head(), linked_list.tail()) == (1, 10)
+
+        assert linked_list.delete(5) is True
+        assert 5 not in linked_list
+        assert linked_list.delete(42) is False
+        assert linked_list.delete_head() is True
+        assert linked_list.delete_tail() is True
+        assert list(linked_list) == [2, 3, 4, 6, 7, 8, 9]
+        assert (linked_list.head(), linked_list.tail()) == (2, 9)
+        assert linked_list[5] == 8
+        assert linked_list[7] is None
+        assert linked_list.mid_point() == 6
+
+        linked_list.reverse()
+        assert list(linked_list) == [9, 8, 7, 6, 4, 3, 2]
+        assert (linked_list.head(), linked_list.tail()) == (9, 2)
+
+        # Freed slots are reused before the arena grows
+        slots = len(linked_list._next)
+        linked_list.append(11)
+        linked_list.prepend(0)
+        linked_list.append(12)
+        assert len(linked_list._next) == slots
+        linked_list.append(13)
+        assert len(linked_list._next) == slots + 1
+        assert list(linked_list) == [0, 9, 8, 7, 6, 4, 3, 2, 11, 12, 13]
+
+        # Deleting the tail by value, and emptying the list
+        assert linked_list.delete(13) is True
+        assert linked_list.tail() == 12
+        while linked_list.delete_head():
+            pass
+        assert linked_list.is_empty() is True
+        assert linked_list.head() is None
+        assert linked_list.mid_point() is None
+        assert str(linked_list) == "None"
+        linked_list.prepend(1)
+        linked_list.append(2)
+        assert list(linked_list) == [1, 2]
+
+    # Matches LinkedList after the same operations. The values are unique,
+    # since LinkedList.delete checks the tail before earlier duplicates.
+    import random
+
+    from linked_list import LinkedList
+
+    reference: LinkedList[int] = LinkedList()
+    arena: ArenaLinkedList[int] = ArenaLinkedList()
+    for n in range(2_000):
+        # Reversing is rare, so that the lists grow long
+        operation = random.choice([0, 1, 2, 3] * 5 + [4])
+        value = n if operation < 2 else random.randrange(n + 1)
+        for target in (reference, arena):
+            if operation == 0:
+                target.append(value)
+            elif operation == 1:
+                target.prepend(value)
+            elif operation == 2:
+                target.delete(value)
+            elif operation == 3:
+                target.delete_head()
+            else:
+                target.reverse()
+        assert str(arena) == str(reference)
+    midpoint = reference.mid_point()
+    assert arena.mid_point() == (midpoint.value if midpoint else None)
+
+    # MEMORY: 1M ints vs. LinkedList
+    import tracemalloc
+    from time import perf_counter
+
+    count = 1_000_000
+    values = list(range(1_000, 1_000 + count))
+
+    sizes = {}
+    for name, factory in (
+        ("LinkedList", lambda: LinkedList(values)),
+        ("ArenaLinkedList", lambda: ArenaLinkedList(values)),
+        ("ArenaLinkedList('q')", lambda: ArenaLinkedList(values, "q")),
+    ):
+        start = perf_counter()
+        built = factory()
+        elapsed = perf_counter() - start
+        del built
+        tracemalloc.start()
+        built = factory()
+        sizes[name] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del built
+        print(f"{name}: {sizes[name] / count:.1f}B per node, built in {elapsed:.4f}s")
+
+    assert sizes["LinkedList"] >= 3 * sizes["ArenaLinkedList"]
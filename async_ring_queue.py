@@ -0,0 +1,291 @@
+"""This module implements an asyncio queue data structure.
+
+The implementation wraps a fixed-capacity circular buffer queue. Coroutines
+waiting for room or for items are parked on futures and woken up
+explicitly, so the event loop is never blocked and never polled.
+"""
+import asyncio
+from collections import deque
+from typing import Callable, Generic, TypeVar
+
+from circular_queue import Queue
+
+T = TypeVar("T")
+
+
+class AsyncRingQueue(Generic[T]):
+    """Represents a bounded queue for coroutines of one event loop.
+
+    Producers wait while the queue is full and consumers wait while it is
+    empty. The fixed capacity of the queue provides backpressure.
+    """
+
+    def __init__(self, size: int = 10):
+        """Initializes a new AsyncRingQueue instance with the provided size.
+
+        Time: Θ(1), Space: Θ(N)
+
+        :param size: The size of the queue.
+        """
+        self._queue: Queue[T] = Queue(size)
+        self._putters: deque[asyncio.Future] = deque()
+        self._getters: deque[asyncio.Future] = deque()
+        # Batch getters wait for a number of items rather than for one
+        self._batch_getters: list[tuple[int, asyncio.Future]] = []
+
+    def put_nowait(self, item: T) -> bool:
+        """Adds the provided `item` to the back of the queue.
+
+        Time: Θ(1), Space: Θ(1)
+
+        :param item: The item to add to the queue.
+        :return: True if the item was added, False if the queue is full.
+        """
+        if not self._queue.enqueue(item):
+            return False
+        self._wakeup_next(self._getters)
+        self._wakeup_batch_getters()
+        return True
+
+    async def put(self, item: T) -> None:
+        """Adds the provided `item` to the back of the queue.
+
+        Waits while the queue is full. Time: Θ(1), Space: Θ(1)
+
+        :param item: The item to add to the queue.
+        """
+        while not self.put_nowait(item):
+            await self._wait(self._putters, self._queue.is_full)
+
+    def get_nowait(self) -> T | None:
+        """Removes and returns the item at the front of the queue.
+
+        Time: Θ(1), Space: Θ(1)
+
+        :return: The removed item or None if the queue is empty.
+        """
+        if self._queue.is_empty():
+            return None
+        item = self._queue.front()
+        self._queue.dequeue()
+        self._wakeup_next(self._putters)
+        return item
+
+    async def get(self) -> T:
+        """Removes and returns the item at the front of the queue.
+
+        Waits while the queue is empty. Time: Θ(1), Space: Θ(1)
+
+        :return: The removed item.
+        """
+        while self._queue.is_empty():
+            await self._wait(self._getters, self._queue.is_empty)
+        return self.get_nowait()  # type: ignore
+
+    async def get_many(self, n: int, timeout: float | None = None) -> list[T]:
+        """Removes and returns up to `n` items from the front of the queue.
+
+        Waits until `n` items are available or `timeout` seconds have
+        passed, whichever comes first. Since the queue is bounded, `n` is
+        capped at its capacity. Time: O(K), Space: O(K)
+
+        :param n: The maximum number of items to remove.
+        :param timeout: The maximum number of seconds to wait, or None to
+        wait until `n` items are available.
+        :return: The removed items, front of the queue first.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        wanted = min(n, self._queue.capacity())
+        while len(self._queue) < wanted:
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                break
+            waiter = loop.create_future()
+            entry = (wanted, waiter)
+            self._batch_getters.append(entry)
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), remaining)
+            except asyncio.TimeoutError:
+                break
+            finally:
+                if entry in self._batch_getters:
+                    self._batch_getters.remove(entry)
+
+        items = self._queue.dequeue_many(n)
+        for _ in items:
+            if not self._wakeup_next(self._putters):
+                break
+        return items
+
+    def is_empty(self) -> bool:
+        """Returns True if the queue is empty, False otherwise.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._queue.is_empty()
+
+    def is_full(self) -> bool:
+        """Returns True if the queue is full, False otherwise.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._queue.is_full()
+
+    def __len__(self) -> int:
+        """Returns the length of the queue.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return len(self._queue)
+
+    async def _wait(
+        self, waiters: deque[asyncio.Future], blocked: Callable[[], bool]
+    ) -> None:
+        """Parks the current coroutine on a future in `waiters`.
+
+        If the coroutine is cancelled after it was woken up, the wakeup is
+        passed on to the next waiter so that it is not lost.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            waiter.cancel()
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                pass
+            if not blocked() and not waiter.cancelled():
+                self._wakeup_next(waiters)
+            raise
+
+    @staticmethod
+    def _wakeup_next(waiters: deque[asyncio.Future]) -> bool:
+        """Wakes up the first waiter that is still waiting.
+
+        :return: True if a waiter was woken up, False otherwise.
+        """
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return True
+        return False
+
+    def _wakeup_batch_getters(self) -> None:
+        """Wakes up the batch getters whose number of items is available."""
+        count = len(self._queue)
+        for wanted, waiter in self._batch_getters:
+            if wanted <= count and not waiter.done():
+                waiter.set_result(None)
+
+
+if __name__ == "__main__":
+
+    async def main() -> None:
+        # TEST CASE #1
+        int_queue: AsyncRingQueue[int] = AsyncRingQueue(3)
+        assert int_queue.get_nowait() is None
+        assert int_queue.put_nowait(1) is True
+        assert int_queue.put_nowait(2) is True
+        assert int_queue.put_nowait(3) is True
+        assert int_queue.put_nowait(4) is False
+        assert int_queue.is_full() is True
+        assert await int_queue.get() == 1
+        assert int_queue.get_nowait() == 2
+        assert len(int_queue) == 1
+        assert await int_queue.get_many(5, timeout=0.01) == [3]
+        assert int_queue.is_empty() is True
+
+        # TEST CASE #2: backpressure
+        int_queue = AsyncRingQueue(2)
+        await int_queue.put(1)
+        await int_queue.put(2)
+        putter = asyncio.create_task(int_queue.put(3))
+        await asyncio.sleep(0)
+        assert putter.done() is False
+        assert await int_queue.get() == 1
+        await putter
+        assert await int_queue.get_many(2) == [2, 3]
+
+        # TEST CASE #3: get_many waits for N items
+        int_queue = AsyncRingQueue(10)
+        batch = asyncio.create_task(int_queue.get_many(3))
+        for n in range(3):
+            await asyncio.sleep(0)
+            assert batch.done() is False
+            await int_queue.put(n)
+        assert await batch == [0, 1, 2]
+
+        # TEST CASE #4: cancelled waiters do not lose wakeups
+        int_queue = AsyncRingQueue(10)
+        first = asyncio.create_task(int_queue.get())
+        second = asyncio.create_task(int_queue.get())
+        await asyncio.sleep(0)
+        first.cancel()
+        int_queue.put_nowait(7)
+        assert await second == 7
+
+        # TEST CASE #5: many producers and consumers
+        int_queue = AsyncRingQueue(16)
+        received: list[int] = []
+
+        async def produce(start: int) -> None:
+            for n in range(start, start + 1_000):
+                await int_queue.put(n)
+
+        async def consume() -> None:
+            for _ in range(1_000):
+                received.append(await int_queue.get())
+
+        await asyncio.gather(
+            *(produce(start) for start in range(0, 4_000, 1_000)),
+            *(consume() for _ in range(4)),
+        )
+        assert sorted(received) == list(range(4_000))
+
+        # BENCHMARK: single producer/consumer vs. asyncio.Queue
+        from time import perf_counter
+
+        async def run(q, put, get) -> float:
+            async def produce() -> None:
+                for n in range(50_000):
+                    await put(q, n)
+
+            async def consume() -> None:
+                for _ in range(50_000):
+                    await get(q)
+
+            start = perf_counter()
+            await asyncio.gather(produce(), consume())
+            return perf_counter() - start
+
+        ring_time = await run(
+            AsyncRingQueue(1_000), AsyncRingQueue.put, AsyncRingQueue.get
+        )
+        asyncio_time = await run(
+            asyncio.Queue(1_000), asyncio.Queue.put, asyncio.Queue.get
+        )
+        print(f"AsyncRingQueue={ring_time:.4f}s, asyncio.Queue={asyncio_time:.4f}s")
+
+        async def run_batched() -> float:
+            q: AsyncRingQueue[int] = AsyncRingQueue(1_000)
+
+            async def produce() -> None:
+                for n in range(50_000):
+                    await q.put(n)
+
+            async def consume() -> None:
+                received = 0
+                while received < 50_000:
+                    received += len(await q.get_many(100, timeout=0.001))
+
+            start = perf_counter()
+            await asyncio.gather(produce(), consume())
+            return perf_counter() - start
+
+        print(f"AsyncRingQueue (batched get)={await run_batched():.4f}s")
+
+    asyncio.run(main())
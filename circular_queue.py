@@ -4,7 +4,9 @@ The implementation uses circular buffering.
 
 See: https://en.wikipedia.org/wiki/Circular_buffer
 """
-from typing import Generic, TypeVar
+from array import array
+from itertools import islice
+from typing import Generic, Iterable, Iterator, Sequence, TypeVar, overload
 
 T = TypeVar("T")
 
@@ -12,21 +14,65 @@ T = TypeVar("T")
 class Queue(Generic[T]):
     """Represents a queue data structure.
 
-    The implementation uses circular buffering.
+    The implementation uses circular buffering. By default the queue has
+    a fixed capacity; a growable queue doubles its capacity when full and,
+    if shrinking is enabled, halves it once occupancy drops to a quarter.
+    An overwriting queue evicts its oldest item when full instead.
+
+    A typed queue stores its items unboxed in an `array.array`.
     """
 
-    def __init__(self, size: int = 10):
+    def __init__(
+        self,
+        size: int = 10,
+        grow: bool = False,
+        shrink: bool = False,
+        typecode: str | None = None,
+        overwrite: bool = False,
+    ):
         """Initializes a new Queue instance with the provided size.
 
         Time: Θ(1), Space: Θ(N)
 
         :param size: The size of the queue.
+        :param grow: Double the capacity instead of rejecting items when
+        the queue is full.
+        :param shrink: Halve the capacity, but never below `size`, when
+        the queue is at most a quarter full.
+        :param typecode: The `array` typecode of the items, or None to
+        store any object.
+        :param overwrite: Evict the front item instead of rejecting items
+        when the queue is full.
         """
-        self._list: list[T | None] = [None] * size
+        self._typecode: str | None = typecode
+        self._list: list[T | None] | array = self._allocate(size)
         self._head: int = 0
         self._tail: int = 0
         self._count: int = 0
         self._capacity: int = size
+        self._min_capacity: int = size
+        self._grow: bool = grow
+        self._shrink: bool = shrink
+        self._overwrite: bool = overwrite
+        self._resize_count: int = 0
+        self._peak_capacity: int = size
+
+    @classmethod
+    def typed(cls, typecode: str, size: int = 10, **kwargs) -> "Queue":
+        """Returns a new Queue that stores its items in an `array.array`.
+
+        Numeric items take a few bytes each instead of a boxed object.
+
+            >>> float_queue = Queue.typed("d", 3)
+            >>> float_queue.enqueue(1.5)
+            True
+            >>> float_queue.to_array()
+            array('d', [1.5])
+
+        :param typecode: The `array` typecode of the items, e.g. "d" or "q".
+        :param size: The size of the queue.
+        """
+        return cls(size, typecode=typecode, **kwargs)
 
     def enqueue(self, item: T) -> bool:
         """Adds the provided `item` to the queue.
@@ -37,8 +83,13 @@ class Queue(Generic[T]):
         :param item: The item to add to the queue.
         :return: True if the operation succeeded, false otherwise.
         """
-        if self.is_full():
-            return False
+        if self._count == self._capacity:
+            if self._grow:
+                self._resize(max(1, self._capacity * 2))
+            elif self._overwrite and self._capacity:
+                self._drop_front(1)
+            else:
+                return False
 
         if self._tail == self._capacity:
             self._tail = 0
@@ -60,14 +111,103 @@ class Queue(Generic[T]):
         if self.is_empty():
             return False
 
+        if not self._typecode:
+            # Release the item so that it can be reclaimed right away
+            self._list[self._head] = None
         self._head += 1
         self._count -= 1
 
         if self._head == self._capacity:
             self._head = 0
 
+        if self._shrink:
+            self._shrink_to_occupancy()
+
         return True
 
+    def enqueue_many(self, items: Iterable[T]) -> int:
+        """Adds as many of the provided `items` as fit to the queue.
+
+        Items are added to the back of the queue in iteration order.
+        Items that do not fit are not consumed from `items`; a growable
+        queue resizes once to fit all of them and an overwriting queue
+        evicts as many front items as needed. At most two slices of the
+        underlying list are written, one on each side of the wrap point.
+        Time: O(K), Space: O(K)
+
+        :param items: The items to add to the queue.
+        :return: The number of items that were added.
+        """
+        if self._grow:
+            batch: list[T] = list(items)
+            new_capacity = self._capacity
+            while new_capacity < self._count + len(batch):
+                new_capacity = max(1, new_capacity * 2)
+            if new_capacity != self._capacity:
+                self._resize(new_capacity)
+        elif self._overwrite:
+            batch = list(items)
+            added = len(batch)
+            # Only the last `capacity` items can survive
+            batch = batch[max(0, added - self._capacity) :]
+            self._drop_front(max(0, self._count + len(batch) - self._capacity))
+            self._write(batch)
+            return added
+        else:
+            batch = list(islice(items, self._capacity - self._count))
+        self._write(batch)
+        return len(batch)
+
+    def dequeue_many(self, n: int) -> list[T]:
+        """Removes up to `n` items from the front of the queue.
+
+        Time: O(K), Space: O(K)
+
+        :param n: The maximum number of items to remove.
+        :return: The removed items, front of the queue first.
+        """
+        items = self.peek_many(n)
+        if items:
+            self._drop_front(len(items))
+            if self._shrink:
+                self._shrink_to_occupancy()
+        return items
+
+    def peek_many(self, n: int) -> list[T]:
+        """Returns up to `n` items from the front of the queue.
+
+        The items are not removed from the queue. Time: O(K), Space: O(K)
+
+        :param n: The maximum number of items to return.
+        :return: The items, front of the queue first.
+        """
+        items = self._front_slice(n)
+        return items.tolist() if self._typecode else items  # type: ignore
+
+    def to_array(self) -> array:
+        """Returns the items of a typed queue as an `array.array`.
+
+        The array is a buffer, front of the queue first.
+        Time: Θ(N), Space: Θ(N)
+        """
+        if not self._typecode:
+            raise ValueError("typed queue required")
+        return self._front_slice(self._count)  # type: ignore
+
+    def segments(self) -> list[Sequence[T]]:
+        """Returns read-only views of the items, front of the queue first.
+
+        There is one view, or two if the items wrap around the end of the
+        underlying list. The views are not copies: they reflect later
+        writes to the same slots, so use them before modifying the queue.
+        A typed queue returns memoryviews. Time: Θ(1), Space: Θ(1)
+        """
+        ranges = self._live_ranges(self._count)
+        if self._typecode:
+            buffer = memoryview(self._list)
+            return [buffer[start:stop].toreadonly() for start, stop in ranges]
+        return [_ListView(self._list, start, stop) for start, stop in ranges]
+
     def front(self) -> None | T:
         """Returns the item from the front of the queue.
 
@@ -86,6 +226,27 @@ class Queue(Generic[T]):
             return None
         return self._list[self._tail - 1]
 
+    def capacity(self) -> int:
+        """Returns the number of items the queue can currently hold.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._capacity
+
+    def peak_capacity(self) -> int:
+        """Returns the largest capacity the queue has had.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._peak_capacity
+
+    def resize_count(self) -> int:
+        """Returns how many times the queue has been resized.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._resize_count
+
     def is_empty(self) -> bool:
         """Returns True if the queue is empty, False otherwise.
 
@@ -96,9 +257,9 @@ class Queue(Generic[T]):
     def is_full(self) -> bool:
         """Returns True if the queue is full, False otherwise.
 
-        Time: Θ(1), Space: Θ(1)
+        A growable queue is never full. Time: Θ(1), Space: Θ(1)
         """
-        return len(self) == self._capacity
+        return not self._grow and len(self) == self._capacity
 
     def __len__(self) -> int:
         """Returns the length of the queue.
@@ -107,8 +268,145 @@ class Queue(Generic[T]):
         """
         return self._count
 
+    def __iter__(self) -> Iterator[T]:
+        """Iterates the items from the front to the end of the queue.
+
+        Time: Θ(N), Space: Θ(1)
+        """
+        items = self._list
+        # Index the live slots, since islice would step over the slots
+        # before `start` too
+        for start, stop in self._live_ranges(self._count):
+            for i in range(start, stop):
+                yield items[i]  # type: ignore
+
+    def _resize(self, new_capacity: int) -> None:
+        """Moves the items into a list of `new_capacity` slots.
+
+        The items are unwrapped so that the head is at index 0.
+        Time: Θ(N), Space: Θ(N)
+        """
+        new_list = self._allocate(new_capacity)
+        new_list[: self._count] = self._front_slice(self._count)
+        self._list = new_list
+        self._head = 0
+        self._tail = self._count
+        self._capacity = new_capacity
+        self._resize_count += 1
+        self._peak_capacity = max(self._peak_capacity, new_capacity)
+
+    def _drop_front(self, k: int) -> None:
+        """Removes `k` items from the front of the queue without reading them.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        if k:
+            if not self._typecode:
+                # Release the items so that they can be reclaimed right away
+                for start, stop in self._live_ranges(k):
+                    self._list[start:stop] = [None] * (stop - start)
+            self._head = (self._head + k) % self._capacity
+            self._count -= k
+
+    def _write(self, batch: list[T]) -> None:
+        """Writes `batch` to the back of the queue, which must have room.
+
+        Time: O(K), Space: O(K)
+        """
+        k = len(batch)
+        if k == 0:
+            return
+        if self._typecode:
+            batch = array(self._typecode, batch)  # type: ignore
+
+        start = 0 if self._tail == self._capacity else self._tail
+        first = min(k, self._capacity - start)
+        self._list[start : start + first] = batch[:first]
+        if first < k:
+            # Wrap around and write the rest at the start of the list
+            self._list[: k - first] = batch[first:]
+            self._tail = k - first
+        else:
+            self._tail = start + first
+        self._count += k
+
+    def _live_ranges(self, k: int) -> list[tuple[int, int]]:
+        """Returns the index ranges of the first `k` items.
+
+        There is one range, or two if the items wrap around.
+        """
+        if k == 0:
+            return []
+        end = self._head + k
+        if end <= self._capacity:
+            return [(self._head, end)]
+        return [(self._head, self._capacity), (0, end - self._capacity)]
+
+    def _allocate(self, size: int) -> list[T | None] | array:
+        """Returns storage for `size` items."""
+        if self._typecode:
+            return array(self._typecode, bytes(size * array(self._typecode).itemsize))
+        return [None] * size
+
+    def _front_slice(self, n: int) -> list[T | None] | array:
+        """Returns a copy of up to `n` items from the front of the storage.
+
+        Time: O(K), Space: O(K)
+        """
+        k = max(0, min(n, self._count))
+        end = self._head + k
+        if end <= self._capacity:
+            return self._list[self._head : end]
+        return self._list[self._head :] + self._list[: end - self._capacity]
+
+    def _shrink_to_occupancy(self) -> None:
+        """Halves the capacity while the queue is at most a quarter full.
+
+        Shrinking at a quarter rather than at half leaves the queue half
+        full afterwards, so alternating enqueue/dequeue cannot thrash.
+        Amortized Time: O(1), Space: O(N)
+        """
+        new_capacity = self._capacity
+        while new_capacity > self._min_capacity and self._count <= new_capacity // 4:
+            new_capacity = max(self._min_capacity, new_capacity // 2)
+        if new_capacity != self._capacity:
+            self._resize(new_capacity)
+
     def __repr__(self):
-        return f"queue={self._list}, head={self._head}, tail={self._tail}"
+        return f"queue={list(self)}, head={self._head}, tail={self._tail}"
+
+
+class _ListView(Sequence[T]):
+    """Represents a read-only view of a slice of a list, without a copy."""
+
+    def __init__(self, items: list, start: int, stop: int):
+        self._items = items
+        self._range = range(start, stop)
+
+    @overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "_ListView[T]":
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            view = _ListView(self._items, 0, 0)
+            view._range = self._range[index]
+            return view
+        return self._items[self._range[index]]
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    def __iter__(self) -> Iterator[T]:
+        for i in self._range:
+            yield self._items[i]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
 
 
 if __name__ == "__main__":
@@ -216,3 +514,159 @@ if __name__ == "__main__":
     int_queue.enqueue(4)
 
     print(int_queue)
+
+    # TEST CASE #4
+    int_queue = Queue(5)
+    assert int_queue.dequeue_many(3) == []
+    assert int_queue.peek_many(3) == []
+    assert int_queue.enqueue_many([1, 2, 3]) == 3
+    assert int_queue.dequeue_many(2) == [1, 2]
+    # Wraps around the end of the list
+    source = iter(range(4, 10))
+    assert int_queue.enqueue_many(source) == 4
+    assert next(source) == 8
+    assert int_queue.is_full() is True
+    assert int_queue.front() == 3
+    assert int_queue.end() == 7
+    assert int_queue.peek_many(10) == [3, 4, 5, 6, 7]
+    assert int_queue.enqueue_many([8]) == 0
+    assert int_queue.dequeue_many(4) == [3, 4, 5, 6]
+    assert int_queue.front() == 7
+    assert int_queue.enqueue(8) is True
+    assert int_queue.dequeue_many(10) == [7, 8]
+    assert int_queue.is_empty() is True
+    assert int_queue.enqueue_many([]) == 0
+
+    print(int_queue)
+
+    # TEST CASE #5
+    int_queue = Queue(2, grow=True, shrink=True)
+    assert int_queue.is_full() is False
+    for n in range(1, 10):
+        assert int_queue.enqueue(n) is True
+    assert int_queue.capacity() == 16
+    assert int_queue.resize_count() == 3
+    assert int_queue.front() == 1
+    assert int_queue.end() == 9
+    assert int_queue.dequeue_many(4) == [1, 2, 3, 4]
+    assert int_queue.capacity() == 16
+    # 4 of 16 slots in use
+    assert int_queue.dequeue() is True
+    assert int_queue.capacity() == 8
+    assert int_queue.dequeue() is True
+    assert int_queue.capacity() == 8
+    assert int_queue.peek_many(3) == [7, 8, 9]
+    assert int_queue.enqueue_many(range(10, 30)) == 20
+    assert int_queue.capacity() == 32
+    assert int_queue.peak_capacity() == 32
+    assert int_queue.dequeue_many(22) == list(range(7, 29))
+    assert int_queue.front() == 29
+    assert int_queue.capacity() == 2
+    assert int_queue.peak_capacity() == 32
+
+    int_queue = Queue(0, grow=True)
+    assert int_queue.enqueue(1) is True
+    assert int_queue.capacity() == 1
+    assert int_queue.dequeue_many(1) == [1]
+    assert int_queue.capacity() == 1
+
+    # TEST CASE #6
+    float_queue: Queue[float] = Queue.typed("d", 3, grow=True)
+    assert float_queue.dequeue_many(1) == []
+    assert float_queue.enqueue(1.5) is True
+    assert float_queue.enqueue_many([2.5, 3.5, 4.5]) == 3
+    assert float_queue.capacity() == 6
+    assert float_queue.front() == 1.5
+    assert float_queue.end() == 4.5
+    assert float_queue.dequeue() is True
+    assert float_queue.peek_many(2) == [2.5, 3.5]
+    assert float_queue.to_array() == array("d", [2.5, 3.5, 4.5])
+    assert float_queue.dequeue_many(3) == [2.5, 3.5, 4.5]
+
+    # TEST CASE #7
+    int_queue = Queue(3, overwrite=True)
+    assert int_queue.enqueue_many([1, 2]) == 2
+    assert int_queue.enqueue(3) is True
+    assert int_queue.enqueue(4) is True
+    assert int_queue.is_full() is True
+    assert int_queue.peek_many(3) == [2, 3, 4]
+    assert int_queue.enqueue_many([5, 6]) == 2
+    assert int_queue.peek_many(3) == [4, 5, 6]
+    assert int_queue.enqueue_many(range(7, 12)) == 5
+    assert int_queue.peek_many(3) == [9, 10, 11]
+    assert int_queue.end() == 11
+    assert int_queue.dequeue_many(3) == [9, 10, 11]
+    assert Queue(0, overwrite=True).enqueue(1) is False
+
+    # TEST CASE #8
+    int_queue = Queue(4)
+    assert list(int_queue) == []
+    assert int_queue.segments() == []
+    int_queue.enqueue_many([1, 2, 3, 4])
+    int_queue.dequeue_many(2)
+    int_queue.enqueue_many([5, 6])
+    assert list(int_queue) == [3, 4, 5, 6]
+    first, second = int_queue.segments()
+    assert list(first) == [3, 4]
+    assert list(second) == [5, 6]
+    assert first[-1] == 4
+    assert list(second[1:]) == [6]
+    assert repr(int_queue) == "queue=[3, 4, 5, 6], head=2, tail=2"
+
+    int_queue = Queue.typed("q", 3)
+    int_queue.enqueue_many([1, 2, 3])
+    int_queue.dequeue()
+    int_queue.enqueue(4)
+    assert list(int_queue) == [2, 3, 4]
+    assert [view.tolist() for view in int_queue.segments()] == [[2, 3], [4]]
+
+    # Dequeued items are released right away
+    import weakref
+
+    class Payload:
+        pass
+
+    object_queue: Queue[Payload] = Queue(3)
+    payload = Payload()
+    released = weakref.ref(payload)
+    object_queue.enqueue(payload)
+    object_queue.enqueue_many([Payload()])
+    del payload
+    object_queue.dequeue()
+    assert released() is None
+    object_queue.dequeue_many(1)
+    assert list(object_queue._list) == [None, None, None]
+
+    import sys
+
+    n = 100_000
+    boxed: Queue[int] = Queue(n)
+    boxed.enqueue_many(range(1_000, 1_000 + n))
+    unboxed: Queue[int] = Queue.typed("q", n)
+    unboxed.enqueue_many(range(1_000, 1_000 + n))
+    boxed_size = sys.getsizeof(boxed._list) + sum(map(sys.getsizeof, boxed._list))
+    unboxed_size = sys.getsizeof(unboxed._list)
+    assert boxed_size >= 4 * unboxed_size
+    print(f"boxed={boxed_size}B, typed={unboxed_size}B")
+
+    # BENCHMARK: per-item loop vs. bulk operations on batches of 1k items
+    from timeit import timeit
+
+    batch = list(range(1000))
+    int_queue = Queue(len(batch))
+
+    def per_item() -> None:
+        for item in batch:
+            int_queue.enqueue(item)
+        while not int_queue.is_empty():
+            int_queue.front()
+            int_queue.dequeue()
+
+    def bulk() -> None:
+        int_queue.enqueue_many(batch)
+        int_queue.dequeue_many(len(batch))
+
+    per_item_time = timeit(per_item, number=100)
+    bulk_time = timeit(bulk, number=100)
+    print(f"per-item={per_item_time:.4f}s, bulk={bulk_time:.4f}s, "
+          f"speedup={per_item_time / bulk_time:.1f}x")
@@ -4,6 +4,9 @@ T = TypeVar("T")
 
 
 class Node(Generic[T]):
+    # No per-node __dict__, which would dwarf the two attributes
+    __slots__ = ("value", "next")
+
     def __init__(self, value: T, next: Union["Node", None]) -> None:
         self.value = value
         self.next = next
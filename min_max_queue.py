@@ -0,0 +1,226 @@
+"""This module implements a queue that tracks its minimum and maximum.
+
+The queue is made of two stacks. Items are pushed onto the inbox stack,
+which only tracks the minimum and maximum of all its items. Items are
+popped from the outbox stack, which, like a MinStack, tracks the minimum
+and maximum of the items from its bottom up to every item. When the
+outbox runs empty, the whole inbox is transferred to it, so each item is
+moved once and every operation is amortized constant time.
+
+    Usage:
+
+    >>> window = MinMaxQueue()
+    >>> for n in [4, 1, 7]:
+    ...     window.enqueue(n)
+    >>> window.min(), window.max()
+    (1, 7)
+    >>> window.dequeue(), window.dequeue()
+    (4, 1)
+    >>> window.min(), window.max()
+    (7, 7)
+    >>> list(sliding_window([4, 1, 7, 2, 5], 3))
+    [(1, 7), (1, 7), (2, 7)]
+"""
+from itertools import accumulate
+from typing import Generic, Iterable, Iterator, TypeVar
+
+from stack import Stack
+
+T = TypeVar("T")
+
+
+class MinMaxQueue(Generic[T]):
+    """Represents a queue with constant time minimum and maximum.
+
+    The items must be comparable with each other.
+    """
+
+    def __init__(self):
+        """Initializes a new, empty MinMaxQueue instance.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        self._inbox: Stack[T] = Stack()
+        self._inbox_min: T | None = None
+        self._inbox_max: T | None = None
+        self._outbox: Stack[T] = Stack()
+        # The minimum and maximum of the outbox items up to each item
+        self._outbox_mins: Stack[T] = Stack()
+        self._outbox_maxes: Stack[T] = Stack()
+
+    def enqueue(self, item: T) -> None:
+        """Adds the provided `item` to the back of the queue.
+
+        Time: Θ(1), Space: Θ(1)
+
+        :param item: The item to add to the queue.
+        """
+        if self._inbox.is_empty():
+            self._inbox_min = self._inbox_max = item
+        elif item < self._inbox_min:  # type: ignore
+            self._inbox_min = item
+        elif item > self._inbox_max:  # type: ignore
+            self._inbox_max = item
+        self._inbox.push(item)
+
+    def dequeue(self) -> T | None:
+        """Removes the item at the front of the queue.
+
+        Time: Θ(1) amortized, Space: Θ(1)
+
+        :return: The removed item or None if the queue is empty.
+        """
+        if self._outbox.is_empty():
+            self._transfer()
+        self._outbox_mins.pop()
+        self._outbox_maxes.pop()
+        return self._outbox.pop()
+
+    def front(self) -> T | None:
+        """Returns the item at the front of the queue.
+
+        The item is not removed from the queue.
+        Time: Θ(1) amortized, Space: Θ(1)
+        """
+        if self._outbox.is_empty():
+            self._transfer()
+        return self._outbox.top()
+
+    def min(self) -> T | None:
+        """Returns the minimum item of the queue, or None if it is empty.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        if self._outbox.is_empty():
+            return self._inbox_min if not self._inbox.is_empty() else None
+        low = self._outbox_mins.top()
+        if self._inbox.is_empty() or low <= self._inbox_min:  # type: ignore
+            return low
+        return self._inbox_min
+
+    def max(self) -> T | None:
+        """Returns the maximum item of the queue, or None if it is empty.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        if self._outbox.is_empty():
+            return self._inbox_max if not self._inbox.is_empty() else None
+        high = self._outbox_maxes.top()
+        if self._inbox.is_empty() or high >= self._inbox_max:  # type: ignore
+            return high
+        return self._inbox_max
+
+    def is_empty(self) -> bool:
+        """Returns True if the queue is empty, False otherwise.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._inbox.is_empty() and self._outbox.is_empty()
+
+    def __len__(self) -> int:
+        """Returns the length of the queue.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return len(self._inbox) + len(self._outbox)
+
+    def _transfer(self) -> None:
+        """Moves every inbox item to the outbox, reversing their order."""
+        # Newest first, so that the oldest item ends up at the top
+        items = self._inbox.pop_many(len(self._inbox))
+        self._outbox.push_many(items)
+        self._outbox_mins.push_many(accumulate(items, min))
+        self._outbox_maxes.push_many(accumulate(items, max))
+
+
+def sliding_window(iterable: Iterable[T], w: int) -> Iterator[tuple[T, T]]:
+    """Yields the (minimum, maximum) of every `w` consecutive items.
+
+    The items are consumed lazily, one at a time, so the iterable can be
+    an unbounded stream. Nothing is yielded for fewer than `w` items.
+    Time: Θ(1) amortized per item, Space: Θ(W)
+    """
+    if w < 1:
+        raise ValueError("w must be positive")
+    window: MinMaxQueue[T] = MinMaxQueue()
+    for item in iterable:
+        window.enqueue(item)
+        if len(window) > w:
+            window.dequeue()
+        if len(window) == w:
+            yield window.min(), window.max()  # type: ignore
+
+
+if __name__ == "__main__":
+    int_queue: MinMaxQueue[int] = MinMaxQueue()
+    assert int_queue.is_empty() is True
+    assert int_queue.dequeue() is None
+    assert int_queue.front() is None
+    assert int_queue.min() is None
+    assert int_queue.max() is None
+    assert len(int_queue) == 0
+
+    for n in [5, 3, 8, 3, 9]:
+        int_queue.enqueue(n)
+    assert len(int_queue) == 5
+    assert int_queue.front() == 5
+    assert (int_queue.min(), int_queue.max()) == (3, 9)
+    assert int_queue.dequeue() == 5
+    # Both the inbox and the outbox hold items
+    int_queue.enqueue(1)
+    assert (int_queue.min(), int_queue.max()) == (1, 9)
+    assert [int_queue.dequeue() for _ in range(4)] == [3, 8, 3, 9]
+    assert (int_queue.min(), int_queue.max()) == (1, 1)
+    assert int_queue.dequeue() == 1
+    assert int_queue.is_empty() is True
+
+    # sliding_window matches rescanning every window
+    import random
+
+    data = [random.randrange(100) for _ in range(1_000)]
+    for w in (1, 2, 7, 100, 1_000):
+        expected = [
+            (min(data[i : i + w]), max(data[i : i + w]))
+            for i in range(len(data) - w + 1)
+        ]
+        assert list(sliding_window(data, w)) == expected
+        assert list(sliding_window(iter(data), w)) == expected
+    assert list(sliding_window(data, 1_001)) == []
+
+    # BENCHMARK: window sizes 10 to 1e5 vs. rescanning and RollingWindow
+    from time import perf_counter
+
+    from rolling_window import RollingWindow
+
+    count = 100_000
+    stream = [random.random() for _ in range(count)]
+
+    def rolling(samples: list[float], w: int) -> Iterator[tuple[float, float]]:
+        window = RollingWindow(w)
+        for sample in samples:
+            window.add(sample)
+            if len(window) == w:
+                yield window.min(), window.max()  # type: ignore
+
+    for w in (10, 100, 1_000, 10_000, 100_000):
+        start = perf_counter()
+        for _ in sliding_window(stream, w):
+            pass
+        queue_time = perf_counter() - start
+
+        start = perf_counter()
+        for _ in rolling(stream, w):
+            pass
+        rolling_time = perf_counter() - start
+
+        if w <= 1_000:
+            start = perf_counter()
+            for i in range(count - w + 1):
+                min(stream[i : i + w]), max(stream[i : i + w])
+            rescan = f"{perf_counter() - start:.4f}s"
+        else:
+            rescan = "skipped"
+        print(
+            f"w={w}: MinMaxQueue={queue_time:.4f}s, "
+            f"RollingWindow={rolling_time:.4f}s, rescan={rescan}"
+        )
@@ -1,71 +1,211 @@
 """This module implements a MinStack data structure."""
+from array import array
+from itertools import accumulate, groupby, islice
+from operator import countOf, itemgetter
+from typing import Any, Callable, Iterable, TypeVar
+
+from aggregate_stack import AggregateStack
 from stack import Stack
 
+T = TypeVar("T")
+
+# The number of items extend scans at once for a new minimum
+_CHUNK_SIZE = 4096
+
+# The NumPy dtype characters of C types that `array` has a typecode for,
+# which is the same character
+_TYPECODES = frozenset("bBhHiIlLqQfd")
+
+
+def _as_array(items: Any) -> array | None:
+    """Returns `items` as an `array.array`, or None if it has no typecode.
+
+    An object with a `dtype` and a `tobytes` method, such as a 1-D NumPy
+    array, is copied as raw bytes if its dtype is one of the C types that
+    `array` supports, in native byte order. NumPy is not imported.
+    """
+    if isinstance(items, array):
+        return items
+    dtype = getattr(items, "dtype", None)
+    code = getattr(dtype, "char", None)
+    if (
+        code not in _TYPECODES
+        or getattr(dtype, "byteorder", "=") not in "=|"
+        or getattr(dtype, "itemsize", None) != array(code).itemsize
+        or getattr(items, "ndim", 1) != 1
+        or not hasattr(items, "tobytes")
+    ):
+        return None
+    return array(code, items.tobytes())
 
-class MinStack:
+
+class MinStack(AggregateStack[T]):
     """Represents a MinStack.
 
     The MinStack provides standard stack operations in addition to
-    retrieving the minimum item in constant time.
+    retrieving the minimum item in constant time. It is an AggregateStack
+    of the minimum, so only the items that lower the minimum are tracked.
+
+    The minimum track is run-length encoded: pushing an item equal to the
+    minimum increments the count of the minimum instead of tracking the
+    item again, so long runs of the minimum take constant space.
     """
 
-    def __init__(self):
+    def __init__(self, key: Callable[[T], Any] | None = None):
         """Initializes a new MinStack instance.
 
         This is a constant time operation.
+
+        :param key: Maps an item to the value to compare, or None to
+        compare the items themselves.
         """
-        self._stack: Stack[int] = Stack()
-        self._min_stack: Stack[int] = Stack()
+        super().__init__(min, key=key, selective=True)
+        # How many items in the stack equal each tracked minimum
+        self._counts: array = array("q")
+
+    @classmethod
+    def from_array(cls, items: Iterable[T]) -> "MinStack[T]":
+        """Returns a new MinStack with the `items` pushed in order.
+
+        If `items` is an `array.array`, or a 1-D NumPy array of a C
+        numeric type, the stack stores its items in an array of the same
+        type, a few bytes each. Any other items are stored as objects.
+
+            >>> min_stack = MinStack.from_array(array("q", [3, 1, 2]))
+            >>> min_stack.min(), min_stack.top()
+            (1, 2)
 
-    def push(self, item: int) -> None:
+        Time: O(N), Space: O(N)
+        """
+        min_stack: MinStack[T] = cls()
+        typed = _as_array(items)
+        if typed is not None:
+            min_stack._stack = Stack.typed(typed.typecode)
+            min_stack._aggregates = Stack.typed(typed.typecode)
+            items = typed  # type: ignore
+        min_stack.extend(items)
+        return min_stack
+
+    def push(self, item: T) -> None:
         """Pushes the `item` onto the stack.
 
         This is a constant time operation.
 
         :param item: The item to push onto the stack.
         """
+        if self._stack.is_empty():
+            self._aggregates.push(item)
+            self._counts.append(1)
+        else:
+            low = self._aggregates.top()
+            if self._key:
+                value, low = self._key(item), self._key(low)
+            else:
+                value = item
+            if value < low:  # type: ignore
+                self._aggregates.push(item)
+                self._counts.append(1)
+            elif value == low:
+                self._counts[-1] += 1
         self._stack.push(item)
 
-        if self._min_stack.is_empty():
-            self._min_stack.push(item)
-        else:
-            min_item = self._min_stack.top()
-            if item <= min_item:  # type: ignore
-                self._min_stack.push(item)
+    def extend(self, items: Iterable[T]) -> None:
+        """Pushes the `items` onto the stack, in iteration order.
+
+        Instead of pushing the items one by one, the minimum track is
+        built from the prefix minima of the items, in chunks. A chunk
+        without a new minimum only needs its minimum and a count of the
+        current one, both of which run in C. With a key function, the
+        items are pushed one by one. An `array.array` is scanned as is,
+        and NumPy arrays of C numeric types are copied into one. Other
+        items with a `tolist` method are converted with it first.
+        Time: O(K), Space: O(K)
+
+        :param items: The items to push onto the stack.
+        """
+        if self._key:
+            for item in items:
+                self.push(item)
+            return
+        batch = _as_array(items)
+        if batch is None:
+            tolist = getattr(items, "tolist", None)
+            batch = tolist() if tolist else list(items)
+        self._stack.push_many(batch)
+        for start in range(0, len(batch), _CHUNK_SIZE):
+            chunk = batch[start : start + _CHUNK_SIZE]
+            low = self._aggregates.top()
+            chunk_low = min(chunk)
+            if low is not None and chunk_low >= low:  # type: ignore
+                # No new minimum, so only the repeats of this one count
+                if chunk_low == low:
+                    self._counts[-1] += chunk.count(low)
+                continue
+            if low is None:
+                prefix = accumulate(chunk, min)
+            else:
+                prefix = islice(accumulate(chunk, min, initial=low), 1, None)
+            # The prefix minima never increase, so each run of an equal
+            # prefix minimum is one tracked minimum
+            for value, run in groupby(zip(prefix, chunk), itemgetter(0)):
+                equal = countOf(map(itemgetter(1), run), value)
+                if value == low:
+                    self._counts[-1] += equal
+                else:
+                    self._aggregates.push(value)
+                    self._counts.append(equal)
 
-    def pop(self) -> int | None:
+    def pop(self) -> T | None:
         """Removes the top item from the stack.
 
         This is a constant time operation.
 
         :return: The removed item or None if the stack is empty.
         """
-        top_item: int | None = self._stack.top()
-        if top_item == self._min_stack.top():
-            self._min_stack.pop()
-        return self._stack.pop()
+        if self._stack.is_empty():
+            return None
+        item = self._stack.pop()
+        low = self._aggregates.top()
+        if self._key:
+            equal = self._key(item) == self._key(low)  # type: ignore
+        else:
+            equal = item == low
+        if equal:
+            self._counts[-1] -= 1
+            if not self._counts[-1]:
+                self._counts.pop()
+                self._aggregates.pop()
+        return item
 
-    def top(self) -> int | None:
-        """Returns the item at the top of the stack.
+    def min(self) -> T | None:
+        """Returns the minimum item from the stack.
 
         This is a constant time operation.
 
-        The item is not removed from the stack.
+        Of the items with the minimum key, the one that was pushed first
+        is returned. The minimum item is not removed from the stack.
         """
-        return self._stack.top()
+        return self._aggregates.top()
 
-    def min(self) -> int | None:
-        """Returns the minimum item from the stack.
+    def aggregate(self) -> Any:
+        """Returns the minimum key of the stack.
 
         This is a constant time operation.
 
-        The minimum item is not removed from the stack.
+        As with any AggregateStack, the aggregate is the minimum of the
+        keys, which is the minimum item itself without a key function.
+        Use `min` for the item with the minimum key.
+
+        :return: The minimum key, or None if the stack is empty.
         """
-        return self._min_stack.top()
+        if self._stack.is_empty():
+            return None
+        low = self._aggregates.top()
+        return self._key(low) if self._key else low
 
 
 if __name__ == "__main__":
-    min_stack = MinStack()
+    min_stack: MinStack[int] = MinStack()
     min_stack.push(2)
 
     assert min_stack.min() == 2
@@ -81,3 +221,163 @@ if __name__ == "__main__":
     assert min_stack.min() == -50
     min_stack.pop()
     assert min_stack.min() == 1
+    min_stack.push(-50)
+    min_stack.push(-50)
+    min_stack.pop()
+    assert min_stack.min() == -50
+    min_stack.pop()
+    assert min_stack.min() == 1
+    assert min_stack.top() == 1
+    assert len(min_stack._aggregates) == 2
+    assert list(min_stack._counts) == [1, 1]
+
+    # Runs of the minimum are counted, not tracked again
+    min_stack = MinStack()
+    for n in [3, 0, 0, 5, 0, 0]:
+        min_stack.push(n)
+    assert len(min_stack._aggregates) == 2
+    assert list(min_stack._counts) == [1, 4]
+    for _ in range(5):
+        assert min_stack.min() == 0
+        min_stack.pop()
+    assert min_stack.min() == 3
+    min_stack.pop()
+    assert min_stack.min() is None
+    assert min_stack.pop() is None
+
+    # Arbitrary objects compared by a key
+    words: MinStack[str] = MinStack(key=len)
+    for word in ["abc", "de", "fg", "hij", "k"]:
+        words.push(word)
+    assert words.min() == "k"
+    assert words.aggregate() == 1
+    words.pop()
+    assert words.min() == "de"
+    words.pop()
+    assert words.min() == "de"
+    words.pop()
+    words.pop()
+    assert words.min() == "abc"
+    assert words.aggregate() == 3
+    words.pop()
+    assert words.aggregate() is None
+
+    # The aggregate matches the generic running minimum's
+    from aggregate_stack import running_min
+
+    for key in (None, len):
+        generic = running_min(key=key)
+        run_length = MinStack(key=key)
+        for word in ["abc", "de", "fg", "hij", "k", "k"]:
+            generic.push(word)
+            run_length.push(word)
+            assert run_length.aggregate() == generic.aggregate()
+        while not generic.is_empty():
+            generic.pop()
+            run_length.pop()
+            assert run_length.aggregate() == generic.aggregate()
+
+    # Bulk loading matches pushing the items one by one
+    import random
+
+    data = [random.randrange(50) for _ in range(20_000)]
+    pushed = MinStack()
+    for n in data:
+        pushed.push(n)
+    for loaded in (
+        MinStack.from_array(data[:7_000]),
+        MinStack.from_array(array("q", data[:7_000])),
+    ):
+        loaded.extend(data[7_000:])
+        assert len(loaded) == len(pushed)
+        assert list(loaded._counts) == list(pushed._counts)
+        assert loaded._aggregates.peek_many(50) == pushed._aggregates.peek_many(50)
+        for _ in range(len(data)):
+            assert loaded.min() == pushed.min()
+            assert loaded.pop() == pushed.pop()
+        for n in data:
+            pushed.push(n)
+    floats = MinStack.from_array(array("d", [2.5, 0.5]))
+    assert floats._stack.to_array() == array("d", [2.5, 0.5])
+    assert floats.min() == 0.5
+
+    # Objects with a NumPy-style dtype are stored typed as well
+    from types import SimpleNamespace
+
+    class _Int32s:
+        dtype = SimpleNamespace(char="i", byteorder="=", itemsize=4)
+        ndim = 1
+
+        def __init__(self, values: list[int]) -> None:
+            self._values = array("i", values)
+
+        def tobytes(self) -> bytes:
+            return self._values.tobytes()
+
+        def tolist(self) -> list[int]:
+            return self._values.tolist()
+
+    ints32 = MinStack.from_array(_Int32s([4, -2, 7]))
+    assert ints32._stack.to_array() == array("i", [4, -2, 7])
+    assert ints32.min() == -2
+    ints32.extend(_Int32s([-3]))
+    assert ints32._stack.to_array() == array("i", [4, -2, 7, -3])
+    assert ints32.min() == -3
+    # Other byte orders are converted with tolist instead
+    _Int32s.dtype = SimpleNamespace(char="i", byteorder=">", itemsize=4)
+    boxed = MinStack.from_array(_Int32s([4, -2]))
+    assert boxed._stack._typecode is None
+    assert boxed.min() == -2
+
+    # BENCHMARK: from_array vs. replaying pushes, 100k ints
+    from time import perf_counter
+
+    ints = array("q", (random.randrange(1_000_000) for _ in range(100_000)))
+    start = perf_counter()
+    replayed = MinStack()
+    for n in ints:
+        replayed.push(n)
+    replay_time = perf_counter() - start
+    start = perf_counter()
+    loaded = MinStack.from_array(ints)
+    load_time = perf_counter() - start
+    assert loaded.min() == replayed.min() == min(ints)
+    print(
+        f"replay={replay_time:.4f}s, from_array={load_time:.4f}s "
+        f"({replay_time / load_time:.1f}x)"
+    )
+    del replayed, loaded
+
+    # BENCHMARK: vs. tracking every item <= the minimum, on skewed input
+    import tracemalloc
+
+    count = 20_000
+    inputs = {
+        "uniform": [random.randrange(1_000_000) for _ in range(count)],
+        "90% zeros": [
+            0 if random.random() < 0.9 else random.randrange(1000)
+            for _ in range(count)
+        ],
+        "descending runs": [n // 1000 for n in range(count, 0, -1)],
+    }
+    for name, data in inputs.items():
+        results = []
+        for factory in (running_min, MinStack):
+            tracemalloc.start()
+            stack = factory()
+            for n in data:
+                stack.push(n)
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del stack
+
+            start = perf_counter()
+            stack = factory()
+            for n in data:
+                stack.push(n)
+                stack.aggregate()
+            while not stack.is_empty():
+                stack.pop()
+                stack.aggregate()
+            results.append(f"{size}B, {perf_counter() - start:.4f}s")
+        print(f"{name}: item track={results[0]}, run-length track={results[1]}")
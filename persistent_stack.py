@@ -0,0 +1,180 @@
+"""This module implements a persistent (immutable) stack data structure.
+
+Pushing or popping returns a new version of the stack and leaves the old
+version unchanged. Versions share their common items as linked list nodes,
+so taking a snapshot is free and rolling back is keeping an old version.
+
+See: https://en.wikipedia.org/wiki/Persistent_data_structure
+
+    Usage:
+
+    >>> empty = PersistentStack()
+    >>> one = empty.push(1)
+    >>> two = one.push(2)
+    >>> two.top(), one.top(), len(empty)
+    (2, 1, 0)
+    >>> list(two.pop()) == list(one)
+    True
+"""
+from typing import Generic, Iterator, TypeVar
+
+from linked_list import Node
+
+T = TypeVar("T")
+
+
+class PersistentStack(Generic[T]):
+    """Represents an immutable stack data structure.
+
+    The items are linked list nodes from the top of the stack down.
+    """
+
+    __slots__ = ("_top", "_size")
+
+    def __init__(self):
+        """Initializes a new, empty PersistentStack instance.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        self._top: Node | None = None
+        self._size: int = 0
+
+    def push(self, item: T) -> "PersistentStack[T]":
+        """Returns a new version with `item` pushed onto this one.
+
+        Time: Θ(1), Space: Θ(1)
+
+        :param item: The item to push onto the stack.
+        """
+        return self._version(Node(item, next=self._top), self._size + 1)
+
+    def pop(self) -> "PersistentStack[T]":
+        """Returns a new version without the top item of this one.
+
+        Popping an empty stack returns the empty stack.
+        Time: Θ(1), Space: Θ(1)
+        """
+        if self._top is None:
+            return self
+        return self._version(self._top.next, self._size - 1)
+
+    def top(self) -> T | None:
+        """Returns the item that is at the top of the stack.
+
+        Time: Θ(1), Space: Θ(1)
+
+        :return: The item at the top of the stack or None if the stack
+        is empty.
+        """
+        if self._top is None:
+            return None
+        return self._top.value
+
+    def is_empty(self) -> bool:
+        """Returns True if the stack is empty, false otherwise.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._size == 0
+
+    def is_full(self) -> bool:
+        """Returns True if the stack is full, false otherwise.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return False
+
+    def __len__(self) -> int:
+        """Returns the length of the stack.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._size
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterates the items from the top of the stack down.
+
+        Time: Θ(N), Space: Θ(1)
+        """
+        node = self._top
+        while node:
+            yield node.value
+            node = node.next
+
+    @staticmethod
+    def _version(top: Node | None, size: int) -> "PersistentStack[T]":
+        """Returns a version with the provided `top` node and `size`."""
+        version: PersistentStack[T] = PersistentStack()
+        version._top = top
+        version._size = size
+        return version
+
+    def __repr__(self) -> str:
+        return f"stack={list(self)[::-1]}"
+
+
+if __name__ == "__main__":
+    empty: PersistentStack[int] = PersistentStack()
+    assert empty.top() is None
+    assert empty.is_empty() is True
+    assert empty.is_full() is False
+    assert len(empty) == 0
+    assert empty.pop() is empty
+
+    one = empty.push(1)
+    two = one.push(2)
+    three = two.push(3)
+    assert three.top() == 3
+    assert len(three) == 3
+    assert list(three) == [3, 2, 1]
+    assert repr(three) == "stack=[1, 2, 3]"
+
+    # Old versions are unchanged
+    assert two.top() == 2
+    assert len(two) == 2
+    assert one.top() == 1
+    assert empty.is_empty() is True
+
+    # Popping rolls back to the previous version
+    assert list(three.pop()) == list(two)
+    branch = two.push(4)
+    assert list(branch) == [4, 2, 1]
+    assert list(three) == [3, 2, 1]
+
+    # Versions that share the bottom of the stack
+    assert two.pop().pop().is_empty() is True
+    # Popping shares the nodes below the top instead of copying them
+    assert three.pop()._top is two._top
+    assert branch.pop().pop().pop().is_empty() is True
+
+    # MEMORY: versions vs. copy-on-checkpoint of a stack.Stack
+    import tracemalloc
+
+    from stack import Stack
+
+    steps = 2_000
+
+    tracemalloc.start()
+    stack: Stack[int] = Stack()
+    checkpoints: list[list[int]] = []
+    for n in range(steps):
+        stack.push(n)
+        checkpoints.append(stack._list[: len(stack)])  # type: ignore
+    copy_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del stack, checkpoints
+
+    tracemalloc.start()
+    version: PersistentStack[int] = PersistentStack()
+    versions: list[PersistentStack[int]] = []
+    for n in range(steps):
+        version = version.push(n)
+        versions.append(version)
+    persistent_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert persistent_size * 10 < copy_size
+    print(
+        f"copy-on-checkpoint={copy_size}B, persistent={persistent_size}B "
+        f"({persistent_size / steps:.0f}B per version)"
+    )
@@ -1,76 +1,166 @@
 """This module implements a queue data structure using a stack
 data structure.
 """
-from typing import Generic, TypeVar
+import threading
+from typing import Generic, Iterator, TypeVar
 
 from stack import Stack
 
 T = TypeVar("T")
 
+# What an enqueue onto a full queue does
+OVERFLOW_POLICIES = ("raise", "block", "drop-oldest")
+
 
 class QueueUsingStack(Generic[T]):
     """Represents a queue data structure.
 
-    The underlying implementation uses a stack data structure.
-    """
+    The underlying implementation uses two stacks. Items are pushed onto
+    the inbox stack and popped from the outbox stack. When the outbox runs
+    empty, the whole inbox is moved to it, which reverses the items so
+    that the oldest one is at the top. Each item is moved once, so every
+    operation is amortized constant time.
 
-    def __init__(self):
-        """Initializes a new QueueUsingStack instance."""
-        self._stack: Stack[T] = Stack()
-        self._temp_stack: Stack[T] = Stack()
-        self._front_item = None
+    The stacks grow as needed. The queue can be limited to a maximum
+    size, in which case enqueuing onto a full queue raises OverflowError,
+    blocks until another thread dequeues, or drops the front item,
+    depending on the overflow policy.
+    """
 
-    def enqueue(self, item: T) -> None:
+    def __init__(
+        self,
+        max_size: int | None = None,
+        overflow: str = "raise",
+        shrink: bool = False,
+    ):
+        """Initializes a new QueueUsingStack instance.
+
+        :param max_size: The maximum number of items in the queue, or None
+        for no limit.
+        :param overflow: One of "raise", "block" or "drop-oldest".
+        :param shrink: Trim the unused slots of the stacks, see `Stack`.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        self._inbox: Stack[T] = Stack(shrink=shrink)
+        self._outbox: Stack[T] = Stack(shrink=shrink)
+        # The bottom item of the inbox, which is the front of the queue
+        # while the outbox is empty
+        self._inbox_front: T | None = None
+        self._size: int | None = max_size
+        self._overflow: str = overflow
+        self._max_size: int = 0
+        self._peak_capacity: int = 0
+        # Only taken by enqueues and dequeues with the "block" policy
+        self._not_full = threading.Condition()
+
+    def enqueue(self, item: T, timeout: float | None = None) -> bool:
         """Adds the provided `item` to the queue.
 
-        Items are added to the back of the queue. This is a constant
-        time operation.
+        Items are added to the back of the queue.
+        Time: Θ(1) amortized, Space: Θ(1)
 
         :param item: The item to add to the queue.
+        :param timeout: With the "block" overflow policy, the maximum
+        number of seconds to wait for room, or None to wait until there is.
+        :return: True if the item was added, False on timeout.
+        :raises OverflowError: If the queue is full and the overflow policy
+        is "raise".
         """
-        self._stack.push(item)
-
-        if len(self._stack) == 1:
-            self._front_item = item
+        if self._overflow == "block":
+            with self._not_full:
+                if not self._not_full.wait_for(lambda: not self.is_full(), timeout):
+                    return False
+                self._enqueue(item)
+            return True
+
+        if self.is_full():
+            if self._overflow == "raise":
+                raise OverflowError("queue is full")
+            self._dequeue()
+        self._enqueue(item)
+        return True
 
     def dequeue(self) -> T | None:
         """Removes the first item from the queue.
 
         Items are removed from the front of the queue.
-        Time: O(N), Space: Θ(1)
+        Time: Θ(1) amortized, Space: Θ(1)
 
-        :return: The removed item.
+        :return: The removed item or None if the queue is empty.
         """
-        if self._stack.is_empty():
-            return None
-
-        top_item: T | None = None
-
-        while not self._stack.is_empty():
-            item = self._stack.pop()
-            if item and len(self._stack) >= 1:
-                self._temp_stack.push(item)
-            else:
-                top_item = item
+        if self._overflow == "block":
+            with self._not_full:
+                item = self._dequeue()
+                self._not_full.notify()
+            return item
+        return self._dequeue()
 
-        assert self._stack.is_empty() is True
+    def dequeue_many(self, n: int) -> list[T]:
+        """Removes up to `n` items from the front of the queue.
 
-        self._front_item = self._temp_stack.top()
-        while not self._temp_stack.is_empty():
-            item = self._temp_stack.pop()
-            if item:
-                self._stack.push(item)
+        The items are moved as slices of the stacks' storage, at most one
+        from the outbox and one from the inbox. Time: O(K), Space: O(K)
 
-        assert self._temp_stack.is_empty() is True
-
-        return top_item
+        :param n: The maximum number of items to remove.
+        :return: The removed items, front of the queue first.
+        """
+        if self._overflow == "block":
+            with self._not_full:
+                items = self._dequeue_many(n)
+                self._not_full.notify(len(items))
+            return items
+        return self._dequeue_many(n)
+
+    def drain(self, batch_size: int = 256) -> Iterator[T]:
+        """Removes and yields the items from the front of the queue.
+
+        Items are removed `batch_size` at a time with `dequeue_many`, until
+        the queue is empty, including items that are enqueued meanwhile.
+        Time: Θ(1) amortized per item, Space: O(B)
+        """
+        while True:
+            items = self.dequeue_many(batch_size)
+            if not items:
+                return
+            yield from items
+
+    def _enqueue(self, item: T) -> None:
+        if self._inbox.is_empty():
+            self._inbox_front = item
+        self._inbox.push(item)
+        size = len(self)
+        if size > self._max_size:
+            self._max_size = size
+            self._peak_capacity = max(self._peak_capacity, self.capacity())
+
+    def _dequeue(self) -> T | None:
+        if self._outbox.is_empty():
+            self._transfer()
+        return self._outbox.pop()
+
+    def _dequeue_many(self, n: int) -> list[T]:
+        items = self._outbox.pop_many(n)
+        if len(items) < n and not self._inbox.is_empty():
+            self._transfer()
+            items.extend(self._outbox.pop_many(n - len(items)))
+        return items
+
+    def _transfer(self) -> None:
+        """Moves every inbox item to the outbox, oldest item on top."""
+        self._peak_capacity = max(self._peak_capacity, self.capacity())
+        self._outbox.push_many(self._inbox.pop_many(len(self._inbox)))
+        self._inbox_front = None
+        self._peak_capacity = max(self._peak_capacity, self.capacity())
 
     def front(self) -> T | None:
         """Returns the item from the front of the queue.
 
         The item is not removed from queue. Time: Θ(1), Space: Θ(1)
         """
-        return self._front_item
+        if not self._outbox.is_empty():
+            return self._outbox.top()
+        return self._inbox_front
 
     def peek(self) -> T | None:
         """Returns the item from the front of the queue.
@@ -84,28 +174,42 @@ class QueueUsingStack(Generic[T]):
 
         Time: Θ(1), Space: Θ(1)
         """
-        return self._stack.is_empty()
+        return self._inbox.is_empty() and self._outbox.is_empty()
 
     def is_full(self) -> bool:
         """Returns True if the queue is full, False otherwise.
 
         Time: Θ(1), Space: Θ(1)
         """
-        return self._stack.is_full()
+        return self._size is not None and len(self) >= self._size
 
     def space(self) -> int:
         """Returns the maximum number of items that were held in the queue.
 
         Time: Θ(1), Space: Θ(1)
         """
-        return self._stack.space()
+        return self._max_size
+
+    def capacity(self) -> int:
+        """Returns the number of slots currently allocated by the stacks.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._inbox.capacity() + self._outbox.capacity()
+
+    def peak_capacity(self) -> int:
+        """Returns the largest number of slots the stacks have allocated.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return max(self._peak_capacity, self.capacity())
 
     def __len__(self) -> int:
         """Returns the length of the queue.
 
         Time: Θ(1), Space: Θ(1)
         """
-        return len(self._stack)
+        return len(self._inbox) + len(self._outbox)
 
 
 if __name__ == "__main__":
@@ -134,3 +238,123 @@ if __name__ == "__main__":
     assert int_queue.is_full() is False
     assert int_queue.space() == 3
     assert len(int_queue) == 2
+
+    # A full queue raises, drops its front item or blocks
+    int_queue = QueueUsingStack(max_size=2)
+    int_queue.enqueue(1)
+    int_queue.enqueue(2)
+    assert int_queue.is_full() is True
+    try:
+        int_queue.enqueue(3)
+        raise AssertionError("expected OverflowError")
+    except OverflowError:
+        pass
+    assert len(int_queue) == 2
+
+    int_queue = QueueUsingStack(max_size=2, overflow="drop-oldest")
+    for n in range(1, 5):
+        assert int_queue.enqueue(n) is True
+    assert int_queue.front() == 3
+    assert int_queue.dequeue() == 3
+    assert int_queue.dequeue() == 4
+
+    int_queue = QueueUsingStack(max_size=1, overflow="block")
+    int_queue.enqueue(1)
+    assert int_queue.enqueue(2, timeout=0.01) is False
+    consumer = threading.Timer(0.05, int_queue.dequeue)
+    consumer.start()
+    assert int_queue.enqueue(2, timeout=5) is True
+    consumer.join()
+    assert int_queue.dequeue() == 2
+
+    # Capacity metrics, with and without trimming the stacks
+    for shrink in (False, True):
+        int_queue = QueueUsingStack(shrink=shrink)
+        for n in range(1, 1_001):
+            int_queue.enqueue(n)
+        while len(int_queue) > 10:
+            int_queue.dequeue()
+        assert int_queue.peak_capacity() >= 1_000
+        assert (int_queue.capacity() < 100) is shrink
+
+    # Falsy items, and front() after any sequence of operations
+    import random
+    from collections import deque
+
+    int_queue = QueueUsingStack()
+    for n in [0, 0, 1, 0]:
+        int_queue.enqueue(n)
+    assert [int_queue.dequeue() for _ in range(5)] == [0, 0, 1, 0, None]
+    assert int_queue.front() is None
+
+    int_queue = QueueUsingStack()
+    expected: deque[int] = deque()
+    for n in range(10_000):
+        if random.random() < 0.5:
+            int_queue.enqueue(n % 4)
+            expected.append(n % 4)
+        else:
+            assert int_queue.dequeue() == (expected.popleft() if expected else None)
+        assert int_queue.front() == (expected[0] if expected else None)
+        assert len(int_queue) == len(expected)
+    assert int_queue.space() >= len(expected)
+
+    # Bulk dequeues across the outbox and the inbox
+    int_queue = QueueUsingStack()
+    assert int_queue.dequeue_many(3) == []
+    assert list(int_queue.drain()) == []
+    for n in range(5):
+        int_queue.enqueue(n)
+    assert int_queue.dequeue() == 0
+    for n in range(5, 8):
+        int_queue.enqueue(n)
+    assert int_queue.dequeue_many(0) == []
+    assert int_queue.dequeue_many(6) == [1, 2, 3, 4, 5, 6]
+    assert int_queue.front() == 7
+    int_queue.enqueue(8)
+    assert list(int_queue.drain(batch_size=1)) == [7, 8]
+    assert int_queue.is_empty() is True
+
+    expected = deque()
+    for n in range(10_000):
+        if random.random() < 0.6:
+            int_queue.enqueue(n)
+            expected.append(n)
+        else:
+            k = random.randrange(5)
+            assert int_queue.dequeue_many(k) == [
+                expected.popleft() for _ in range(min(k, len(expected)))
+            ]
+    assert list(int_queue.drain(batch_size=7)) == list(expected)
+
+    # BENCHMARK: dequeue in a loop vs. dequeue_many(256) vs. drain()
+    from time import perf_counter
+
+    count = 100_000
+    for name in ("dequeue", "dequeue_many", "drain"):
+        int_queue = QueueUsingStack()
+        for n in range(count):
+            int_queue.enqueue(n)
+        start = perf_counter()
+        if name == "dequeue":
+            while not int_queue.is_empty():
+                int_queue.dequeue()
+        elif name == "dequeue_many":
+            while int_queue.dequeue_many(256):
+                pass
+        else:
+            for _ in int_queue.drain():
+                pass
+        elapsed = perf_counter() - start
+        print(f"{name}: {elapsed:.4f}s, {elapsed / count * 1e9:.0f}ns per item")
+
+    # BENCHMARK: enqueue then drain N items
+    for count in (1_000, 10_000, 100_000):
+        int_queue = QueueUsingStack()
+        start = perf_counter()
+        for n in range(count):
+            int_queue.enqueue(n)
+        while not int_queue.is_empty():
+            int_queue.dequeue()
+        elapsed = perf_counter() - start
+        print(f"N={count}: {elapsed:.4f}s, {elapsed / count * 1e9:.0f}ns per item")
@@ -0,0 +1,251 @@
+"""This module implements a double-ended queue data structure.
+
+The implementation extends the circular buffer queue with insertion at the
+front and removal at the back, so both ends are constant time.
+
+See: https://en.wikipedia.org/wiki/Double-ended_queue
+"""
+from typing import TypeVar
+
+from circular_queue import Queue
+
+T = TypeVar("T")
+
+
+class RingDeque(Queue[T]):
+    """Represents a double-ended queue data structure.
+
+    The implementation uses circular buffering. Items can be added and
+    removed at both ends; the front is the head of the underlying queue.
+    The deque is bounded unless it is created with `grow=True`.
+    """
+
+    def push_back(self, item: T) -> bool:
+        """Adds the provided `item` to the back of the deque.
+
+        Time: Θ(1), Space: Θ(1)
+
+        :return: True if the operation succeeded, false otherwise.
+        """
+        return self.enqueue(item)
+
+    def push_front(self, item: T) -> bool:
+        """Adds the provided `item` to the front of the deque.
+
+        On a full overwriting deque, the back item is evicted.
+        Time: Θ(1), Space: Θ(1)
+
+        :return: True if the operation succeeded, false otherwise.
+        """
+        if self._count == self._capacity:
+            if self._grow:
+                self._resize(max(1, self._capacity * 2))
+            elif self._overwrite and self._capacity:
+                self._drop_back()
+            else:
+                return False
+
+        if self._count == 0:
+            # Place the item so that the tail follows it
+            self._head = self._tail % self._capacity
+        self._head = (self._head - 1) % self._capacity
+        self._list[self._head] = item
+        self._count += 1
+        if self._count == 1:
+            self._tail = self._head + 1
+
+        return True
+
+    def pop_front(self) -> T | None:
+        """Removes the item at the front of the deque.
+
+        Time: Θ(1), Space: Θ(1)
+
+        :return: The removed item or None if the deque is empty.
+        """
+        item = self.front()
+        self.dequeue()
+        return item
+
+    def pop_back(self) -> T | None:
+        """Removes the item at the back of the deque.
+
+        Time: Θ(1), Space: Θ(1)
+
+        :return: The removed item or None if the deque is empty.
+        """
+        if self.is_empty():
+            return None
+        item = self.end()
+        self._drop_back()
+        if self._shrink:
+            self._shrink_to_occupancy()
+        return item
+
+    def rotate(self, k: int = 1) -> None:
+        """Rotates the deque `k` steps to the right.
+
+        Rotating one step to the right is the same as moving the back item
+        to the front; a negative `k` rotates to the left. When the deque
+        is full only the head and tail indices move, otherwise the shorter
+        side is moved across the free slots.
+        Time: O(min(K, N - K)), Space: Θ(1)
+        """
+        if self._count <= 1:
+            return
+        k %= self._count
+        if k == 0:
+            return
+
+        if self._count == self._capacity:
+            self._head = (self._head - k) % self._capacity
+            self._tail = self._head or self._capacity
+        elif k <= self._count - k:
+            for _ in range(k):
+                self.push_front(self.pop_back())  # type: ignore
+        else:
+            for _ in range(self._count - k):
+                self.push_back(self.pop_front())  # type: ignore
+
+    def __getitem__(self, offset: int) -> T | None:
+        """Returns the item at `offset` from the front of the deque.
+
+        Negative offsets count from the back. Time: Θ(1), Space: Θ(1)
+
+        :return: The item or None if `offset` is out of range.
+        """
+        if offset < 0:
+            offset += self._count
+        if offset < 0 or offset >= self._count:
+            return None
+        return self._list[(self._head + offset) % self._capacity]
+
+    def _drop_back(self) -> None:
+        """Removes the back item without reading it.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        self._tail -= 1
+        if not self._typecode:
+            # Release the item so that it can be reclaimed right away
+            self._list[self._tail] = None
+        self._count -= 1
+        if self._tail == 0 and self._count:
+            self._tail = self._capacity
+
+    def __repr__(self):
+        return f"deque={list(self)}, head={self._head}, tail={self._tail}"
+
+
+if __name__ == "__main__":
+    # TEST CASE #1
+    int_deque: RingDeque[int] = RingDeque(4)
+    assert int_deque.pop_back() is None
+    assert int_deque.pop_front() is None
+    assert int_deque[0] is None
+    assert int_deque.push_front(2) is True
+    assert int_deque.push_front(1) is True
+    assert int_deque.push_back(3) is True
+    assert int_deque.push_back(4) is True
+    assert int_deque.push_front(0) is False
+    assert list(int_deque) == [1, 2, 3, 4]
+    assert int_deque[0] == 1
+    assert int_deque[3] == 4
+    assert int_deque[-1] == 4
+    assert int_deque[4] is None
+    assert int_deque.front() == 1
+    assert int_deque.end() == 4
+
+    # Full: only the indices move
+    int_deque.rotate(1)
+    assert list(int_deque) == [4, 1, 2, 3]
+    assert int_deque.end() == 3
+    int_deque.rotate(-2)
+    assert list(int_deque) == [2, 3, 4, 1]
+    assert int_deque.end() == 1
+
+    assert int_deque.pop_back() == 1
+    assert int_deque.pop_front() == 2
+    assert list(int_deque) == [3, 4]
+    int_deque.rotate(1)
+    assert list(int_deque) == [4, 3]
+    assert int_deque.pop_back() == 3
+    assert int_deque.pop_back() == 4
+    assert int_deque.is_empty() is True
+
+    # The regular queue operations keep working after either end was used
+    assert int_deque.push_front(5) is True
+    assert int_deque.enqueue(6) is True
+    assert int_deque.dequeue_many(2) == [5, 6]
+    for n in range(10):
+        int_deque.push_back(n)
+        assert int_deque.pop_front() == n
+        int_deque.push_front(n)
+        assert int_deque.end() == n
+        assert int_deque.pop_back() == n
+
+    # TEST CASE #2: growable and overwriting deques
+    int_deque = RingDeque(1, grow=True)
+    for n in range(10):
+        int_deque.push_front(n)
+    assert list(int_deque) == list(range(9, -1, -1))
+    assert int_deque.capacity() == 16
+    int_deque.rotate(3)
+    assert list(int_deque) == [2, 1, 0] + list(range(9, 2, -1))
+
+    int_deque = RingDeque(3, overwrite=True)
+    int_deque.enqueue_many([1, 2, 3])
+    int_deque.push_front(0)
+    assert list(int_deque) == [0, 1, 2]
+
+    # Compare against collections.deque
+    import random
+    from collections import deque
+
+    random.seed(3)
+    expected: deque[int] = deque()
+    int_deque = RingDeque(64)
+    for n in range(5_000):
+        op = random.randrange(5)
+        if op == 0 and len(expected) < 64:
+            expected.append(n)
+            int_deque.push_back(n)
+        elif op == 1 and len(expected) < 64:
+            expected.appendleft(n)
+            int_deque.push_front(n)
+        elif op == 2 and expected:
+            assert int_deque.pop_back() == expected.pop()
+        elif op == 3 and expected:
+            assert int_deque.pop_front() == expected.popleft()
+        else:
+            k = random.randrange(-10, 10)
+            expected.rotate(k)
+            int_deque.rotate(k)
+        assert list(int_deque) == list(expected)
+        assert int_deque.end() == (expected[-1] if expected else None)
+
+    # BENCHMARK: mixed-end workload vs. collections.deque
+    from timeit import timeit
+
+    ring: RingDeque[int] = RingDeque(1_024)
+    std: deque[int] = deque(maxlen=1_024)
+
+    def ring_workload() -> None:
+        for n in range(512):
+            ring.push_back(n)
+            ring.push_front(n)
+        for _ in range(512):
+            ring.pop_back()
+            ring.pop_front()
+
+    def deque_workload() -> None:
+        for n in range(512):
+            std.append(n)
+            std.appendleft(n)
+        for _ in range(512):
+            std.pop()
+            std.popleft()
+
+    ring_time = timeit(ring_workload, number=50)
+    deque_time = timeit(deque_workload, number=50)
+    print(f"RingDeque={ring_time:.4f}s, collections.deque={deque_time:.4f}s")
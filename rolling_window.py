@@ -0,0 +1,203 @@
+"""This module implements a rolling window over a stream of samples.
+
+The window is an overwriting circular buffer queue: adding a sample to a
+full window evicts the oldest one. Aggregates are updated incrementally
+as samples enter and leave, so reading them never scans the window.
+The minimum and maximum are tracked with monotonic queues.
+
+See: https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance
+
+    Usage:
+
+    >>> window = RollingWindow(3)
+    >>> for sample in [4.0, 1.0, 7.0, 2.0]:
+    ...     window.add(sample)
+    >>> window.min(), window.max(), window.mean()
+    (1.0, 7.0, 3.3333333333333335)
+"""
+from collections import deque
+
+from circular_queue import Queue
+
+
+class RollingWindow:
+    """Represents the most recent samples of a stream and their aggregates."""
+
+    def __init__(self, size: int = 10):
+        """Initializes a new RollingWindow instance with the provided size.
+
+        Time: Θ(1), Space: Θ(N)
+
+        :param size: The number of samples in a full window.
+        """
+        self._window: Queue[float] = Queue(size, overwrite=True)
+        self._sum: float = 0.0
+        # Running mean and sum of squared deviations (Welford)
+        self._mean: float = 0.0
+        self._m2: float = 0.0
+        # Sequence number of the next sample
+        self._seq: int = 0
+        # (sequence number, sample) pairs with increasing/decreasing samples
+        self._min_candidates: deque[tuple[int, float]] = deque()
+        self._max_candidates: deque[tuple[int, float]] = deque()
+
+    def add(self, sample: float) -> None:
+        """Adds the provided `sample`, evicting the oldest one if full.
+
+        Amortized Time: O(1), Space: Θ(1)
+
+        :param sample: The sample to add to the window.
+        """
+        if self._window.is_full():
+            # A window of size 0 never holds a sample
+            if self._window.is_empty():
+                return
+            self._remove(self._window.front())  # type: ignore
+        self._window.enqueue(sample)
+
+        self._sum += sample
+        delta = sample - self._mean
+        self._mean += delta / len(self._window)
+        self._m2 += delta * (sample - self._mean)
+
+        while self._min_candidates and self._min_candidates[-1][1] >= sample:
+            self._min_candidates.pop()
+        self._min_candidates.append((self._seq, sample))
+        while self._max_candidates and self._max_candidates[-1][1] <= sample:
+            self._max_candidates.pop()
+        self._max_candidates.append((self._seq, sample))
+        self._seq += 1
+
+    def count(self) -> int:
+        """Returns the number of samples in the window.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return len(self._window)
+
+    def sum(self) -> float:
+        """Returns the sum of the samples in the window.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._sum
+
+    def mean(self) -> float | None:
+        """Returns the mean of the samples, or None if the window is empty.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        if self._window.is_empty():
+            return None
+        return self._mean
+
+    def variance(self) -> float | None:
+        """Returns the population variance of the samples.
+
+        Returns None if the window is empty. Time: Θ(1), Space: Θ(1)
+        """
+        if self._window.is_empty():
+            return None
+        return max(0.0, self._m2 / len(self._window))
+
+    def min(self) -> float | None:
+        """Returns the smallest sample, or None if the window is empty.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        if not self._min_candidates:
+            return None
+        return self._min_candidates[0][1]
+
+    def max(self) -> float | None:
+        """Returns the largest sample, or None if the window is empty.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        if not self._max_candidates:
+            return None
+        return self._max_candidates[0][1]
+
+    def __len__(self) -> int:
+        """Returns the number of samples in the window.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return len(self._window)
+
+    def _remove(self, sample: float) -> None:
+        """Reverts the aggregates for the oldest `sample` before eviction.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        oldest_seq = self._seq - len(self._window)
+        remaining = len(self._window) - 1
+
+        self._sum -= sample
+        if remaining == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+        else:
+            delta = sample - self._mean
+            self._mean -= delta / remaining
+            self._m2 -= delta * (sample - self._mean)
+
+        if self._min_candidates[0][0] == oldest_seq:
+            self._min_candidates.popleft()
+        if self._max_candidates[0][0] == oldest_seq:
+            self._max_candidates.popleft()
+
+
+if __name__ == "__main__":
+    import random
+    import statistics
+
+    window = RollingWindow(3)
+    assert window.count() == 0
+    assert window.mean() is None
+    assert window.variance() is None
+    assert window.min() is None
+    assert window.max() is None
+
+    window.add(5.0)
+    assert window.min() == 5.0
+    assert window.max() == 5.0
+    assert window.variance() == 0.0
+
+    for sample in [3.0, 8.0, 1.0]:
+        window.add(sample)
+    # The window is [3.0, 8.0, 1.0]
+    assert len(window) == 3
+    assert window.sum() == 12.0
+    assert window.mean() == 4.0
+    assert window.min() == 1.0
+    assert window.max() == 8.0
+
+    window.add(2.0)
+    window.add(2.0)
+    # The window is [1.0, 2.0, 2.0]
+    assert window.max() == 2.0
+    window.add(3.0)
+    # The window is [2.0, 2.0, 3.0]
+    assert window.min() == 2.0
+
+    # Compare against a full scan of the window
+    random.seed(7)
+    samples = [random.uniform(-100, 100) for _ in range(2_000)]
+    size = 50
+    window = RollingWindow(size)
+    for i, sample in enumerate(samples):
+        window.add(sample)
+        expected = samples[max(0, i + 1 - size) : i + 1]
+        assert window.count() == len(expected)
+        assert window.min() == min(expected)
+        assert window.max() == max(expected)
+        assert abs(window.sum() - sum(expected)) < 1e-6
+        mean, variance = window.mean(), window.variance()
+        assert abs(mean - statistics.fmean(expected)) < 1e-9  # type: ignore
+        assert abs(variance - statistics.pvariance(expected)) < 1e-6  # type: ignore
+
+    window = RollingWindow(0)
+    window.add(1.0)
+    assert window.count() == 0
+    assert window.min() is None
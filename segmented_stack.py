@@ -0,0 +1,249 @@
+"""This module implements a segmented stack data structure.
+
+The items are stored in fixed-size chunks, so growing the stack allocates
+a new chunk instead of copying the existing items into a bigger list.
+
+Optionally, only the top `max_resident` chunks, plus one, are kept in
+memory. Colder chunks further down are pickled to a temporary file and
+read back when pops reach them. Since a stack is only ever accessed at
+the top, chunks are spilled and read back in stack order: the file is
+append-only and is truncated when the last spilled chunk is read back.
+The extra chunk keeps pushes and pops that alternate across a chunk
+boundary from spilling and reading back the same chunk every time.
+
+    Usage:
+
+    >>> int_stack = SegmentedStack(chunk_size=2)
+    >>> for n in range(5):
+    ...     int_stack.push(n)
+    >>> int_stack.pop(), int_stack.top(), len(int_stack)
+    (4, 3, 4)
+"""
+import pickle
+import tempfile
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SegmentedStack(Generic[T]):
+    """Represents a stack data structure stored in fixed-size chunks."""
+
+    def __init__(self, chunk_size: int = 4096, max_resident: int = 0):
+        """Initializes a new instance of SegmentedStack.
+
+        Time: Θ(1), Space: Θ(1)
+
+        :param chunk_size: The number of items per chunk.
+        :param max_resident: The number of chunks to keep in memory, plus
+        one, or 0 to keep every chunk in memory. Spilled items must be
+        picklable.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self._chunk_size: int = chunk_size
+        self._max_resident: int = max_resident
+        # None marks a chunk that was spilled to the file
+        self._chunks: list[list[T | None] | None] = []
+        # The most recently emptied chunk, kept to avoid reallocating it
+        # when pushes and pops alternate across a chunk boundary
+        self._spare: list[T | None] | None = None
+        self._size: int = 0
+        self._max_size: int = 0
+        self._resident: int = 0
+        self._peak_resident: int = 0
+        self._lowest_resident: int = 0
+        self._spill_file = None
+        # Start offset of each spilled chunk in the file, bottom chunk first
+        self._spill_offsets: list[int] = []
+
+    def push(self, item: T) -> None:
+        """Pushes the `item` onto the stack.
+
+        Time: Θ(1) (amortized when spilling), Space: Θ(1)
+
+        :param item: The item to push onto the stack.
+        """
+        index, offset = divmod(self._size, self._chunk_size)
+        if offset == 0:
+            chunk = self._spare or [None] * self._chunk_size
+            self._spare = None
+            self._chunks.append(chunk)
+            self._resident += 1
+            self._peak_resident = max(self._peak_resident, self._resident)
+            # Spill one chunk late, so that a chunk is only read back after
+            # at least a chunk's worth of pops
+            if self._max_resident and self._resident > self._max_resident + 1:
+                self._spill_lowest()
+        self._chunks[index][offset] = item  # type: ignore
+        self._size += 1
+        self._max_size = max(self._max_size, self._size)
+
+    def pop(self) -> T | None:
+        """Removes the item at the top of the stack.
+
+        Time: Θ(1) (amortized when spilling), Space: Θ(1)
+
+        :return: The removed item or None if the stack is empty.
+        """
+        if self.is_empty():
+            return None
+        self._size -= 1
+        index, offset = divmod(self._size, self._chunk_size)
+        chunk = self._chunks[index]
+        assert chunk is not None
+        item = chunk[offset]
+        # Release the item so that it can be reclaimed right away
+        chunk[offset] = None
+        if offset == 0:
+            self._chunks.pop()
+            self._resident -= 1
+            self._spare = chunk
+            if index > 0 and self._chunks[index - 1] is None:
+                self._load(index - 1)
+        return item
+
+    def top(self) -> T | None:
+        """Returns the item that is currently at the top of the stack.
+
+        Time: Θ(1), Space: Θ(1)
+
+        :return: The item at the top of the stack or None if the stack
+        is empty.
+        """
+        if self.is_empty():
+            return None
+        index, offset = divmod(self._size - 1, self._chunk_size)
+        return self._chunks[index][offset]  # type: ignore
+
+    def is_empty(self) -> bool:
+        """Returns True if the stack is empty, false otherwise.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._size == 0
+
+    def is_full(self) -> bool:
+        """Returns True if the stack is full, false otherwise.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return False
+
+    def space(self) -> int:
+        """Returns the maximum number of items that were held in the stack.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._max_size
+
+    def resident_chunks(self) -> int:
+        """Returns the number of chunks currently held in memory.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._resident
+
+    def peak_resident_chunks(self) -> int:
+        """Returns the largest number of chunks that were held in memory.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._peak_resident
+
+    def spilled_chunks(self) -> int:
+        """Returns the number of chunks currently stored in the file.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return len(self._spill_offsets)
+
+    def close(self) -> None:
+        """Deletes the spill file, if any. The stack must not be used after."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def __len__(self) -> int:
+        """Returns the length of the stack.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._size
+
+    def _spill_lowest(self) -> None:
+        """Writes the lowest resident chunk to the end of the spill file."""
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile()
+        index = self._lowest_resident
+        self._spill_file.seek(0, 2)
+        self._spill_offsets.append(self._spill_file.tell())
+        pickle.dump(self._chunks[index], self._spill_file, pickle.HIGHEST_PROTOCOL)
+        self._chunks[index] = None
+        self._lowest_resident += 1
+        self._resident -= 1
+
+    def _load(self, index: int) -> None:
+        """Reads chunk `index`, the last one in the spill file, back."""
+        assert self._spill_file is not None
+        offset = self._spill_offsets.pop()
+        self._spill_file.seek(offset)
+        self._chunks[index] = pickle.load(self._spill_file)
+        self._spill_file.truncate(offset)
+        self._lowest_resident = index
+        self._resident += 1
+        self._peak_resident = max(self._peak_resident, self._resident)
+
+
+if __name__ == "__main__":
+    int_stack: SegmentedStack[int] = SegmentedStack(chunk_size=3)
+    assert int_stack.pop() is None
+    assert int_stack.top() is None
+    assert int_stack.is_empty() is True
+    assert int_stack.is_full() is False
+    assert int_stack.space() == 0
+
+    for n in range(10):
+        int_stack.push(n)
+    assert len(int_stack) == 10
+    assert int_stack.top() == 9
+    assert int_stack.resident_chunks() == 4
+    assert int_stack.pop() == 9
+    assert int_stack.resident_chunks() == 3
+    # Alternating across the chunk boundary reuses the spare chunk
+    int_stack.push(9)
+    assert int_stack.pop() == 9
+    assert [int_stack.pop() for _ in range(9)] == list(range(8, -1, -1))
+    assert int_stack.is_empty() is True
+    assert int_stack.space() == 10
+    assert int_stack.peak_resident_chunks() == 4
+
+    # Spilling cold chunks to disk
+    int_stack = SegmentedStack(chunk_size=4, max_resident=2)
+    for n in range(50):
+        int_stack.push(n)
+    assert int_stack.resident_chunks() == 3
+    assert int_stack.spilled_chunks() == 10
+    assert int_stack.peak_resident_chunks() == 4
+    for n in range(49, 19, -1):
+        assert int_stack.top() == n
+        assert int_stack.pop() == n
+    for n in range(20, 30):
+        int_stack.push(n)
+    assert [int_stack.pop() for _ in range(30)] == list(range(29, -1, -1))
+    assert int_stack.spilled_chunks() == 0
+    assert int_stack.is_empty() is True
+    int_stack.close()
+
+    # Alternating across a chunk boundary does not spill or read back
+    int_stack = SegmentedStack(chunk_size=4, max_resident=1)
+    for n in range(9):
+        int_stack.push(n)
+    assert int_stack.spilled_chunks() == 1
+    for _ in range(100):
+        assert int_stack.pop() == 8
+        assert int_stack.spilled_chunks() == 1
+        int_stack.push(8)
+        assert int_stack.spilled_chunks() == 1
+    assert [int_stack.pop() for _ in range(9)] == list(range(8, -1, -1))
+    int_stack.close()
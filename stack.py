@@ -15,24 +15,54 @@ does not require an initial size.
     >>> int_stack.top()
     1
 """
-from typing import Generic, TypeVar
+from array import array
+from typing import Generic, Iterable, TypeVar
 
 T = TypeVar("T")
 
 
 class Stack(Generic[T]):
-    """Represents a stack data structure."""
+    """Represents a stack data structure.
 
-    def __init__(self):
+    Popped slots are kept for reuse by later pushes. With shrinking
+    enabled, the slots are trimmed to half once the stack is at most a
+    quarter of their number.
+
+    A typed stack stores its items unboxed in an `array.array`.
+    """
+
+    def __init__(self, typecode: str | None = None, shrink: bool = False):
         """Initializes a new instance of Stack.
 
         Time: Θ(1), Space: Θ(1)
+
+        :param typecode: The `array` typecode of the items, or None to
+        store any object.
+        :param shrink: Trim unused slots after a pop leaves the stack at
+        most a quarter full.
         """
-        self._list: list[T] = []
+        self._typecode: str | None = typecode
+        self._list: list[T] | array = array(typecode) if typecode else []
         # The stack pointer always points to the 'top' item + 1
         self._stack_pointer: int = 0
-        # How many items were appended to the list?
+        # What is the most items that were held in the list?
         self._max_size: int = 0
+        self._shrink: bool = shrink
+
+    @classmethod
+    def typed(cls, typecode: str, **kwargs) -> "Stack":
+        """Returns a new Stack that stores its items in an `array.array`.
+
+        Numeric items take a few bytes each instead of a boxed object.
+
+            >>> int_stack = Stack.typed("q")
+            >>> int_stack.push(1)
+            >>> int_stack.to_array()
+            array('q', [1])
+
+        :param typecode: The `array` typecode of the items, e.g. "d" or "q".
+        """
+        return cls(typecode, **kwargs)
 
     def push(self, item: T):
         """Pushes the `item` onto the stack.
@@ -49,8 +79,8 @@ class Stack(Generic[T]):
         else:
             # Otherwise append to the end of the list
             self._list.append(item)
-            self._max_size += 1
             self._stack_pointer += 1
+            self._max_size = max(self._max_size, self._stack_pointer)
             assert len(self) == len(self._list)
 
     def pop(self) -> T | None:
@@ -63,7 +93,68 @@ class Stack(Generic[T]):
         if self.is_empty():
             return None
         self._stack_pointer -= 1
-        return self._list[self._stack_pointer]
+        item = self._list[self._stack_pointer]
+        if not self._typecode:
+            # Release the item so that it can be reclaimed right away
+            self._list[self._stack_pointer] = None  # type: ignore
+        if self._shrink:
+            self._trim()
+        return item
+
+    def push_many(self, items: Iterable[T]) -> None:
+        """Pushes the `items` onto the stack, in iteration order.
+
+        Popped slots are reused first, then the rest is appended, each
+        with a single slice operation. Time: O(K), Space: O(K)
+
+        :param items: The items to push onto the stack.
+        """
+        batch = array(self._typecode, items) if self._typecode else list(items)
+        k = len(batch)
+        reused = min(k, len(self._list) - self._stack_pointer)
+        self._list[self._stack_pointer : self._stack_pointer + reused] = batch[:reused]
+        if reused < k:
+            self._list.extend(batch[reused:] if reused else batch)  # type: ignore
+        self._stack_pointer += k
+        self._max_size = max(self._max_size, self._stack_pointer)
+
+    def extend(self, items: Iterable[T]) -> None:
+        """Pushes the `items` onto the stack, in iteration order.
+
+        Same as `push_many`. Time: O(K), Space: O(K)
+        """
+        self.push_many(items)
+
+    def pop_many(self, n: int) -> list[T]:
+        """Removes up to `n` items from the top of the stack.
+
+        Time: O(K), Space: O(K)
+
+        :return: The removed items, top of the stack first.
+        """
+        items = self.peek_many(n)
+        k = len(items)
+        if k:
+            self._stack_pointer -= k
+            if not self._typecode:
+                # Release the items so that they can be reclaimed right away
+                top = self._stack_pointer + k
+                self._list[self._stack_pointer : top] = [None] * k  # type: ignore
+            if self._shrink:
+                self._trim()
+        return items
+
+    def peek_many(self, n: int) -> list[T]:
+        """Returns up to `n` items from the top of the stack.
+
+        The items are not removed. Time: O(K), Space: O(K)
+
+        :return: The items, top of the stack first.
+        """
+        k = max(0, min(n, self._stack_pointer))
+        items = self._list[self._stack_pointer - k : self._stack_pointer]
+        items.reverse()
+        return items.tolist() if self._typecode else items  # type: ignore
 
     def top(self) -> T | None:
         """Returns the item that is currently at the top of the stack.
@@ -77,6 +168,30 @@ class Stack(Generic[T]):
             return None
         return self._list[self._stack_pointer - 1]
 
+    def shrink_to_fit(self) -> None:
+        """Releases the slots above the top of the stack.
+
+        Time: O(N), Space: Θ(1)
+        """
+        del self._list[self._stack_pointer :]
+
+    def capacity(self) -> int:
+        """Returns the number of slots currently allocated for items.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return len(self._list)
+
+    def to_array(self) -> array:
+        """Returns the items of a typed stack as an `array.array`.
+
+        The array is a buffer, bottom of the stack first.
+        Time: Θ(N), Space: Θ(N)
+        """
+        if not self._typecode:
+            raise ValueError("typed stack required")
+        return self._list[: self._stack_pointer]  # type: ignore
+
     def is_empty(self) -> bool:
         """Returns True if the stack is empty, false otherwise.
 
@@ -94,6 +209,8 @@ class Stack(Generic[T]):
     def space(self) -> int:
         """Returns the maximum number of items that were held in the stack.
 
+        See `capacity` for the number of slots that are held now.
+
         Time: Θ(1), Space: Θ(1)
         """
         return self._max_size
@@ -105,6 +222,15 @@ class Stack(Generic[T]):
         """
         return self._stack_pointer
 
+    def _trim(self) -> None:
+        """Halves the slots while the stack is at most a quarter of them.
+
+        Trimming to half rather than to fit leaves room to grow again, so
+        alternating push/pop cannot thrash. Amortized Time: O(1)
+        """
+        while self._list and self._stack_pointer <= len(self._list) // 4:
+            del self._list[len(self._list) // 2 :]
+
     def __repr__(self) -> str:
         return f"stack={self._list}"
 
@@ -158,3 +284,125 @@ if __name__ == "__main__":
     int_stack.push(45)
     int_stack.pop()
     assert int_stack.top() == 88
+
+    float_stack: Stack[float] = Stack.typed("d")
+    assert float_stack.pop() is None
+    float_stack.push(1.5)
+    float_stack.push(2.5)
+    assert float_stack.pop() == 2.5
+    float_stack.push(3.5)
+    assert float_stack.space() == 2
+    assert float_stack.to_array() == array("d", [1.5, 3.5])
+
+    # Popped items are released and unused slots can be trimmed
+    import weakref
+
+    class Payload:
+        pass
+
+    object_stack: Stack[Payload] = Stack()
+    payload = Payload()
+    released = weakref.ref(payload)
+    object_stack.push(payload)
+    del payload
+    object_stack.pop()
+    assert released() is None
+    assert object_stack.capacity() == 1
+    object_stack.shrink_to_fit()
+    assert object_stack.capacity() == 0
+    assert object_stack.space() == 1
+    object_stack.push(Payload())
+    assert object_stack.space() == 1
+
+    int_stack = Stack(shrink=True)
+    for n in range(16):
+        int_stack.push(n)
+    for _ in range(11):
+        int_stack.pop()
+    # 5 of 16 slots in use
+    assert int_stack.capacity() == 16
+    assert int_stack.pop() == 4
+    assert int_stack.capacity() == 8
+    assert int_stack.pop() == 3
+    assert int_stack.capacity() == 8
+    assert int_stack.pop() == 2
+    assert int_stack.capacity() == 4
+    assert int_stack.space() == 16
+    int_stack.push(2)
+    int_stack.push(3)
+    assert int_stack.capacity() == 4
+    assert int_stack.top() == 3
+    int_stack.pop()
+    assert int_stack.pop() == 2
+    assert int_stack.capacity() == 4
+    assert int_stack.pop() == 1
+    assert int_stack.capacity() == 2
+    int_stack.push(1)
+    assert int_stack.top() == 1
+
+    float_stack = Stack.typed("d", shrink=True)
+    for n in range(8):
+        float_stack.push(float(n))
+    for _ in range(7):
+        float_stack.pop()
+    assert float_stack.capacity() == 2
+    float_stack.shrink_to_fit()
+    assert float_stack.to_array() == array("d", [0.0])
+
+    # Bulk operations
+    int_stack = Stack()
+    assert int_stack.pop_many(2) == []
+    int_stack.push_many([1, 2, 3, 4])
+    assert int_stack.pop_many(3) == [4, 3, 2]
+    # Reuses the popped slots before appending
+    int_stack.push_many(range(5, 10))
+    assert int_stack.capacity() == 6
+    assert int_stack.space() == 6
+    assert int_stack.peek_many(2) == [9, 8]
+    assert int_stack.top() == 9
+    int_stack.extend([10])
+    assert int_stack.pop_many(10) == [10, 9, 8, 7, 6, 5, 1]
+    assert int_stack.is_empty() is True
+    assert int_stack.space() == 7
+
+    int_stack = Stack.typed("q", shrink=True)
+    int_stack.push_many(range(16))
+    assert int_stack.pop_many(15) == list(range(15, 0, -1))
+    assert int_stack.capacity() == 2
+    int_stack.push_many([1, 2])
+    assert int_stack.to_array() == array("q", [0, 1, 2])
+
+    # BENCHMARK: per-item loop vs. bulk operations on runs of 1k items
+    from timeit import timeit
+
+    run = list(range(1000))
+    int_stack = Stack()
+
+    def per_item() -> None:
+        for item in run:
+            int_stack.push(item)
+        for _ in run:
+            int_stack.pop()
+
+    def bulk() -> None:
+        int_stack.push_many(run)
+        int_stack.pop_many(len(run))
+
+    per_item_time = timeit(per_item, number=100)
+    bulk_time = timeit(bulk, number=100)
+    print(
+        f"per-item={per_item_time:.4f}s, bulk={bulk_time:.4f}s, "
+        f"speedup={per_item_time / bulk_time:.1f}x"
+    )
+
+    import sys
+
+    boxed: Stack[int] = Stack()
+    unboxed: Stack[int] = Stack.typed("q")
+    for n in range(1_000, 101_000):
+        boxed.push(n)
+        unboxed.push(n)
+    boxed_size = sys.getsizeof(boxed._list) + sum(map(sys.getsizeof, boxed._list))
+    unboxed_size = sys.getsizeof(unboxed._list)
+    assert boxed_size >= 4 * unboxed_size
+    print(f"boxed={boxed_size}B, typed={unboxed_size}B")
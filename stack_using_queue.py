@@ -1,76 +1,150 @@
 """This module implements a stack data structure using a queue
 data structure.
 """
+import threading
 from typing import Generic, TypeVar
 
 from circular_queue import Queue
 
 T = TypeVar("T")
 
+# Where the cost of reordering the queue into stack order is paid
+STRATEGIES = ("push", "pop", "lazy")
+
+# What a push onto a full stack does
+OVERFLOW_POLICIES = ("raise", "block", "drop-oldest")
+
 
 class StackUsingQueue(Generic[T]):
     """Represents a stack data structure.
 
-    The underlying implementation uses a queue data structure.
+    The underlying implementation uses a queue data structure. Queues only
+    give access to their front, so either pushes or pops rotate the queue
+    to bring the top of the stack there:
+
+    * "push": a push rotates every other item behind the new one, so the
+      queue is always in stack order and a pop is a dequeue.
+    * "pop": a push is an enqueue, and a pop rotates every item but the
+      last one behind it.
+    * "lazy": pushes are buffered in a second queue. A pop moves the buffer
+      onto the front of the queue, reversed, in one batch, so that the
+      following pops are dequeues. A buffer of at most √N items is popped
+      by rotating it instead. A flush moves N items but only follows more
+      than √N pushes, so every operation is O(√N) amortized.
+
+    Rotations move slices of the queue's storage, not single items.
+
+    A growable stack doubles its queues when they are full, a single slice
+    copy each, up to an optional maximum size. Pushing onto a full stack
+    raises OverflowError, blocks until another thread pops, or drops the
+    item at the bottom of the stack, depending on the overflow policy.
     """
 
-    def __init__(self, n: int = 10):
+    def __init__(
+        self,
+        n: int = 10,
+        strategy: str = "lazy",
+        grow: bool = False,
+        max_size: int | None = None,
+        overflow: str = "raise",
+    ):
         """Initializes a new StackUsingQueue instance.
 
         Time: Θ(1), Space: Θ(N)
+
+        :param n: The maximum number of items in the stack, or the initial
+        size of the queues of a growable stack.
+        :param strategy: One of "push", "pop" or "lazy".
+        :param grow: Grow the queues instead of limiting the stack to `n`
+        items.
+        :param max_size: The maximum number of items in a growable stack,
+        or None for no limit.
+        :param overflow: One of "raise", "block" or "drop-oldest".
         """
-        self._queue: Queue[T] = Queue(n)
-        self._temp_queue: Queue[T] = Queue(n)
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        self._strategy: str = strategy
+        self._size: int | None = max_size if grow else n
+        self._overflow: str = overflow
+        # In stack order (top at the front), except with the "pop" strategy
+        self._queue: Queue[T] = Queue(n, grow=grow)
+        # The buffered pushes of the "lazy" strategy, in push order
+        self._temp_queue: Queue[T] = Queue(n, grow=grow)
         self._max_size = 0
+        # Only taken by pushes and pops with the "block" overflow policy
+        self._not_full = threading.Condition()
 
-    def push(self, item: T) -> None:
+    def push(self, item: T, timeout: float | None = None) -> bool:
         """Pushes the `item` onto the stack.
 
-        Time: Θ(1), Space: Θ(1)
+        Time: O(N) with the "push" strategy, Θ(1) otherwise. Space: Θ(1)
 
         :param item: The item to push onto the stack.
+        :param timeout: With the "block" overflow policy, the maximum
+        number of seconds to wait for room, or None to wait until there is.
+        :return: True if the item was pushed, False on timeout.
+        :raises OverflowError: If the stack is full and the overflow policy
+        is "raise".
         """
-        self._queue.enqueue(item)
-        self._max_size += 1
+        if self._overflow == "block":
+            with self._not_full:
+                if not self._not_full.wait_for(lambda: not self.is_full(), timeout):
+                    return False
+                self._push(item)
+            return True
+
+        if self.is_full():
+            if self._overflow == "raise":
+                raise OverflowError("stack is full")
+            self._drop_bottom()
+        self._push(item)
+        return True
 
-    # Dequeuing from one queue into another queue (enqueue)
-    # maintains the order of items
     def pop(self) -> T | None:
         """Removes the item at the top of the stack.
 
-        Time: O(N), Space: Θ(1)
+        Time: O(N) with the "pop" strategy, Θ(1) with the "push" strategy
+        and O(√N) amortized with the "lazy" strategy. Space: Θ(1)
 
         :return: The removed item or None if the stack is empty.
         """
-        if self._queue.is_empty():
+        if self._overflow == "block":
+            with self._not_full:
+                item = self._pop()
+                self._not_full.notify()
+            return item
+        return self._pop()
+
+    def _push(self, item: T) -> None:
+        if self._strategy == "lazy":
+            self._temp_queue.enqueue(item)
+        else:
+            self._queue.enqueue(item)
+            if self._strategy == "push":
+                self._rotate(self._queue, len(self._queue) - 1)
+        self._max_size = max(self._max_size, len(self))
+
+    def _pop(self) -> T | None:
+        if self.empty():
             return None
 
-        end_item: T | None = self._queue.end()
-
-        # Take an item from the front of the 'real' queue and enqueue it
-        # on the temporary queue. Do not enqueue the item that is
-        # currently at the end of the 'real' queue.
-        while not self._queue.is_empty():
-            item = self._queue.front()
-            if item and item != end_item:
-                self._temp_queue.enqueue(item)
-            self._queue.dequeue()
-
-        # The queue should be empty
-        assert self._queue.is_empty() is True
-
-        # Enqueue the items from the temp queue on to the 'real' queue,
-        # effectively putting back the items in their original order
-        while not self._temp_queue.is_empty():
-            item = self._temp_queue.front()
-            if item:
-                self._queue.enqueue(item)
-            self._temp_queue.dequeue()
-
-        # The temp queue should be empty
-        assert self._temp_queue.is_empty() is True
-
-        return end_item  # type: ignore
+        queue = self._queue
+        if self._strategy == "pop":
+            self._rotate(queue, len(queue) - 1)
+        elif self._strategy == "lazy" and not self._temp_queue.is_empty():
+            buffered = len(self._temp_queue)
+            if buffered * buffered <= len(queue):
+                # Cheaper to rotate the buffer than to move the whole stack
+                queue = self._temp_queue
+                self._rotate(queue, buffered - 1)
+            else:
+                self._flush()
+
+        item = queue.front()
+        queue.dequeue()
+        return item
 
     def top(self) -> T | None:
         """Returns the item that is currently at the top of the stack.
@@ -80,9 +154,11 @@ class StackUsingQueue(Generic[T]):
         :return: The item at the top of the stack or None if the stack
         is empty.
         """
-        if self._queue.is_empty():
-            return None
-        return self._queue.end()
+        if self._strategy == "pop":
+            return self._queue.end()
+        if not self._temp_queue.is_empty():
+            return self._temp_queue.end()
+        return self._queue.front()
 
     def peek(self) -> T | None:
         """Returns the item that is currently at the top of the stack.
@@ -99,14 +175,14 @@ class StackUsingQueue(Generic[T]):
 
         Time: Θ(1), Space: Θ(1)
         """
-        return self._queue.is_empty()
+        return self._queue.is_empty() and self._temp_queue.is_empty()
 
     def is_full(self) -> bool:
         """Returns True if the stack is full, false otherwise.
 
         Time: Θ(1), Space: Θ(1)
         """
-        return self._queue.is_full()
+        return self._size is not None and len(self) >= self._size
 
     def space(self) -> int:
         """Returns the maximum number of items that were held in the stack.
@@ -115,12 +191,61 @@ class StackUsingQueue(Generic[T]):
         """
         return self._max_size
 
+    def capacity(self) -> int:
+        """Returns the number of slots currently allocated by the queues.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._queue.capacity() + self._temp_queue.capacity()
+
+    def peak_capacity(self) -> int:
+        """Returns the sum of the largest capacity each queue has had.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._queue.peak_capacity() + self._temp_queue.peak_capacity()
+
+    def resize_count(self) -> int:
+        """Returns how many times the queues were resized.
+
+        Time: Θ(1), Space: Θ(1)
+        """
+        return self._queue.resize_count() + self._temp_queue.resize_count()
+
     def __len__(self) -> int:
         """Returns the length of the stack.
 
         Time: Θ(1), Space: Θ(1)
         """
-        return len(self._queue)
+        return len(self._queue) + len(self._temp_queue)
+
+    @staticmethod
+    def _rotate(queue: Queue[T], k: int) -> None:
+        """Moves the `k` items at the front of `queue` to its back."""
+        if k > 0:
+            queue.enqueue_many(queue.dequeue_many(k))
+
+    def _drop_bottom(self) -> None:
+        """Removes the item at the bottom of the stack.
+
+        Time: Θ(1) with the "pop" strategy, or with the "lazy" strategy
+        while every item is buffered, O(N) otherwise. Space: Θ(1)
+        """
+        if self._strategy == "pop" or self._queue.is_empty():
+            queue = self._temp_queue if self._strategy == "lazy" else self._queue
+        else:
+            # In stack order, the bottom item is at the back of the queue
+            queue = self._queue
+            self._rotate(queue, len(queue) - 1)
+        queue.dequeue()
+
+    def _flush(self) -> None:
+        """Moves the buffered pushes, reversed, to the front of the queue."""
+        buffered = self._temp_queue.dequeue_many(len(self._temp_queue))
+        buffered.reverse()
+        below = self._queue.dequeue_many(len(self._queue))
+        self._queue.enqueue_many(buffered)
+        self._queue.enqueue_many(below)
 
 
 if __name__ == "__main__":
@@ -146,3 +271,107 @@ if __name__ == "__main__":
     assert int_stack.space() == 3
     assert len(int_stack) == 2
     assert int_stack.top() == 2
+
+    # Every strategy returns falsy items and duplicates of the top
+    import random
+
+    for strategy in STRATEGIES:
+        int_stack = StackUsingQueue(8, strategy=strategy)
+        for n in [0, 5, 0, 5, 5]:
+            int_stack.push(n)
+        assert [int_stack.pop() for _ in range(5)] == [5, 5, 0, 5, 0]
+        assert int_stack.pop() is None
+
+        # A full stack raises instead of losing the item
+        for n in range(8):
+            int_stack.push(n)
+        assert int_stack.is_full() is True
+        try:
+            int_stack.push(8)
+            raise AssertionError("expected OverflowError")
+        except OverflowError:
+            pass
+        assert len(int_stack) == 8
+        assert int_stack.top() == 7
+
+        # Dropping the oldest item makes room for the new one
+        int_stack = StackUsingQueue(4, strategy=strategy, overflow="drop-oldest")
+        for n in range(3):
+            int_stack.push(n)
+        int_stack.pop()
+        for n in range(3, 7):
+            assert int_stack.push(n) is True
+        assert [int_stack.pop() for _ in range(5)] == [6, 5, 4, 3, None]
+
+        # Growable stacks resize their queues up to the maximum size
+        int_stack = StackUsingQueue(2, strategy=strategy, grow=True, max_size=50)
+        for n in range(50):
+            int_stack.push(n)
+        assert int_stack.is_full() is True
+        assert int_stack.space() == 50
+        assert int_stack.resize_count() > 0
+        assert int_stack.peak_capacity() >= int_stack.capacity() >= 50
+        assert [int_stack.pop() for _ in range(50)] == list(range(49, -1, -1))
+        assert StackUsingQueue(2, grow=True).is_full() is False
+
+        # A blocked push waits for a pop in another thread
+        int_stack = StackUsingQueue(2, strategy=strategy, overflow="block")
+        int_stack.push(1)
+        int_stack.push(2)
+        assert int_stack.push(3, timeout=0.01) is False
+        popper = threading.Timer(0.05, int_stack.pop)
+        popper.start()
+        assert int_stack.push(3, timeout=5) is True
+        popper.join()
+        assert [int_stack.pop() for _ in range(3)] == [3, 1, None]
+
+        # Random mixes of pushes and pops behave like a list
+        int_stack = StackUsingQueue(100, strategy=strategy)
+        expected: list[int] = []
+        for n in range(5_000):
+            if random.random() < 0.55 and len(expected) < 100:
+                int_stack.push(n % 3)
+                expected.append(n % 3)
+            else:
+                assert int_stack.pop() == (expected.pop() if expected else None)
+            assert int_stack.top() == (expected[-1] if expected else None)
+            assert len(int_stack) == len(expected)
+
+    # BENCHMARK: push-heavy and pop-heavy mixes per strategy
+    from time import perf_counter
+
+    ops = 10_000
+    for size in (100, 1_000, 4_000):
+        for push_ratio in (0.9, 0.5, 0.1):
+            # Runs of pushes and pops, as a producer/consumer would issue
+            mix = [random.random() < push_ratio for _ in range(ops // 10)]
+            times = []
+            for strategy in STRATEGIES:
+                int_stack = StackUsingQueue(size, strategy=strategy)
+                for n in range(size // 2):
+                    int_stack.push(n)
+                start = perf_counter()
+                for is_push in mix:
+                    for n in range(10):
+                        if is_push:
+                            if not int_stack.is_full():
+                                int_stack.push(n)
+                        else:
+                            int_stack.pop()
+                times.append(f"{strategy}={perf_counter() - start:.4f}s")
+            print(f"size={size}, pushes={push_ratio:.0%}: {', '.join(times)}")
+
+    # BENCHMARK: growing from 16 slots vs. preallocated, and the worst push
+    for grow in (False, True):
+        int_stack = StackUsingQueue(16 if grow else 1 << 17, grow=grow)
+        worst = 0.0
+        start = perf_counter()
+        for n in range(1 << 17):
+            push_start = perf_counter()
+            int_stack.push(n)
+            worst = max(worst, perf_counter() - push_start)
+        print(
+            f"grow={grow}: {perf_counter() - start:.4f}s, worst push={worst:.4f}s, "
+            f"resizes={int_stack.resize_count()}, "
+            f"peak capacity={int_stack.peak_capacity()}"
+        )
@@ -0,0 +1,288 @@
+"""This module implements a work-stealing thread pool.
+
+Each worker owns a bounded double-ended queue of tasks. The owner pushes
+and pops tasks at the back; an idle worker steals half of another
+worker's tasks from the front. Tasks that do not fit in a worker's deque
+go to a shared, growable overflow queue. Each deque has its own lock, so
+there is no single lock that every task has to pass through.
+
+See: https://en.wikipedia.org/wiki/Work_stealing
+
+    Usage:
+
+    >>> pool = WorkStealingPool(2)
+    >>> pool.submit(pow, 2, 10).result()
+    1024
+    >>> pool.map(abs, [-1, -2, 3])
+    [1, 2, 3]
+    >>> pool.shutdown()
+"""
+import itertools
+import random
+import threading
+from concurrent.futures import Future
+from time import perf_counter
+from typing import Any, Callable, Iterable
+
+from circular_queue import Queue
+from ring_deque import RingDeque
+
+# future, function, positional arguments, keyword arguments
+Task = tuple[Future, Callable, tuple, dict]
+
+
+class _Worker:
+    """Represents the deque and statistics of one worker thread."""
+
+    def __init__(self, size: int):
+        self.deque: RingDeque[Task] = RingDeque(size)
+        self.lock = threading.Lock()
+        self.tasks: int = 0
+        self.steals: int = 0
+        self.stolen: int = 0
+        self.idle_time: float = 0.0
+
+
+class WorkStealingPool:
+    """Represents a pool of threads that run submitted tasks."""
+
+    def __init__(self, workers: int = 4, size: int = 256):
+        """Initializes a new WorkStealingPool and starts its threads.
+
+        :param workers: The number of worker threads.
+        :param size: The size of each worker's deque.
+        """
+        self._workers: list[_Worker] = [_Worker(size) for _ in range(workers)]
+        self._overflow: Queue[Task] = Queue(size, grow=True)
+        self._overflow_lock = threading.Lock()
+        self._overflowed: int = 0
+        self._local = threading.local()
+        # The round-robin position of tasks submitted from other threads;
+        # next() on a count is atomic, unlike incrementing an int
+        self._next = itertools.count()
+        # Idle workers sleep here until work is submitted
+        self._work_available = threading.Condition()
+        # The number of tasks submitted so far, under _work_available
+        self._submitted: int = 0
+        self._pending: int = 0
+        self._all_done = threading.Condition()
+        self._shutdown: bool = False
+        self._threads = [
+            threading.Thread(target=self._run, args=(worker,), daemon=True)
+            for worker in self._workers
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Schedules `fn(*args, **kwargs)` to run on the pool.
+
+        Tasks submitted from a worker thread go to that worker's deque;
+        other tasks are spread across the workers round-robin.
+
+        :return: A future for the result of the call.
+        """
+        if self._shutdown:
+            raise RuntimeError("cannot submit after shutdown")
+        future: Future = Future()
+        with self._all_done:
+            self._pending += 1
+        self._push((future, fn, args, kwargs))
+        with self._work_available:
+            self._submitted += 1
+            self._work_available.notify()
+        return future
+
+    def map(self, fn: Callable, items: Iterable, chunksize: int = 1) -> list:
+        """Returns the results of calling `fn` on each of the `items`.
+
+        The items are submitted in chunks of `chunksize` items, one task
+        per chunk, and the results keep the order of the items.
+        """
+        items = list(items)
+        chunks = [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+        futures = [self.submit(_map_chunk, fn, chunk) for chunk in chunks]
+        return [result for future in futures for result in future.result()]
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Waits until every submitted task has finished.
+
+        :return: True if every task has finished, False on timeout.
+        """
+        with self._all_done:
+            return self._all_done.wait_for(lambda: self._pending == 0, timeout)
+
+    def shutdown(self) -> None:
+        """Waits for the submitted tasks and stops the worker threads."""
+        self.join()
+        with self._work_available:
+            self._shutdown = True
+            self._work_available.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def stats(self) -> dict[str, Any]:
+        """Returns per-worker task, steal and idle time counts.
+
+        `steals` counts successful steal operations and `stolen` the
+        tasks they took. `overflowed` counts tasks that did not fit in a
+        worker's deque.
+        """
+        return {
+            "tasks": [worker.tasks for worker in self._workers],
+            "steals": [worker.steals for worker in self._workers],
+            "stolen": [worker.stolen for worker in self._workers],
+            "idle_time": [worker.idle_time for worker in self._workers],
+            "overflowed": self._overflowed,
+        }
+
+    def _push(self, task: Task) -> None:
+        worker: _Worker | None = getattr(self._local, "worker", None)
+        if worker is None:
+            worker = self._workers[next(self._next) % len(self._workers)]
+        with worker.lock:
+            if worker.deque.push_back(task):
+                return
+        with self._overflow_lock:
+            self._overflow.enqueue(task)
+            self._overflowed += 1
+
+    def _take(self, worker: _Worker) -> Task | None:
+        """Returns the next task for `worker`, stealing if necessary."""
+        with worker.lock:
+            task = worker.deque.pop_back()
+        if task is not None:
+            return task
+
+        if not self._overflow.is_empty():
+            with self._overflow_lock:
+                tasks = self._overflow.dequeue_many(worker.deque.capacity() // 2 + 1)
+            if tasks:
+                return self._keep(worker, tasks)
+
+        start = random.randrange(len(self._workers))
+        for i in range(len(self._workers)):
+            victim = self._workers[(start + i) % len(self._workers)]
+            if victim is worker or victim.deque.is_empty():
+                continue
+            with victim.lock:
+                tasks = victim.deque.dequeue_many(max(1, len(victim.deque) // 2))
+            if tasks:
+                worker.steals += 1
+                worker.stolen += len(tasks)
+                return self._keep(worker, tasks)
+        return None
+
+    def _keep(self, worker: _Worker, tasks: list[Task]) -> Task:
+        """Queues all but the first of `tasks` on `worker` and returns it.
+
+        Tasks that no longer fit in the worker's deque go to the overflow
+        queue.
+        """
+        rest = tasks[1:]
+        if rest:
+            with worker.lock:
+                kept = worker.deque.enqueue_many(rest)
+            if kept < len(rest):
+                with self._overflow_lock:
+                    self._overflow.enqueue_many(rest[kept:])
+        return tasks[0]
+
+    def _run(self, worker: _Worker) -> None:
+        self._local.worker = worker
+        while True:
+            # Tasks pushed before this read are found by _take, and tasks
+            # pushed after it change the count, so no wakeup is missed
+            submitted = self._submitted
+            task = self._take(worker)
+            if task is None:
+                if self._shutdown:
+                    return
+                idle_start = perf_counter()
+                with self._work_available:
+                    self._work_available.wait_for(
+                        lambda: self._submitted != submitted or self._shutdown
+                    )
+                worker.idle_time += perf_counter() - idle_start
+                continue
+
+            future, fn, args, kwargs = task
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as error:
+                    future.set_exception(error)
+            worker.tasks += 1
+            with self._all_done:
+                self._pending -= 1
+                if self._pending == 0:
+                    self._all_done.notify_all()
+
+
+def _map_chunk(fn: Callable, chunk: list) -> list:
+    return [fn(item) for item in chunk]
+
+
+if __name__ == "__main__":
+    # TEST CASE #1
+    pool = WorkStealingPool(4, size=8)
+    assert pool.submit(sum, [1, 2, 3]).result() == 6
+    assert pool.map(lambda n: n * n, range(100), chunksize=7) == [
+        n * n for n in range(100)
+    ]
+    failed = pool.submit(int, "not a number")
+    assert isinstance(failed.exception(), ValueError)
+
+    # Tasks that spawn tasks are stolen by other workers
+    results: list[int] = []
+    lock = threading.Lock()
+
+    def spawn(depth: int) -> None:
+        if depth == 0:
+            with lock:
+                results.append(depth)
+            return
+        for _ in range(2):
+            pool.submit(spawn, depth - 1)
+
+    pool.submit(spawn, 10)
+    assert pool.join(timeout=10) is True
+    assert len(results) == 2**10
+    stats = pool.stats()
+    # sum, 15 map chunks, int and the spawn tree
+    assert sum(stats["tasks"]) == 1 + 15 + 1 + 2**11 - 1
+
+    # Idle workers wake for each task; a missed wakeup would time out
+    for n in range(200):
+        assert pool.submit(abs, -n).result(timeout=5) == n
+    pool.shutdown()
+
+    # BENCHMARK: many tiny tasks vs. ThreadPoolExecutor
+    from concurrent.futures import ThreadPoolExecutor
+
+    count = 20_000
+
+    def tiny(n: int) -> int:
+        return n + 1
+
+    pool = WorkStealingPool(4)
+    start = perf_counter()
+    futures = [pool.submit(tiny, n) for n in range(count)]
+    pool.join()
+    pool_time = perf_counter() - start
+    assert [future.result() for future in futures] == list(range(1, count + 1))
+    stats = pool.stats()
+    pool.shutdown()
+
+    with ThreadPoolExecutor(4) as executor:
+        start = perf_counter()
+        futures = [executor.submit(tiny, n) for n in range(count)]
+        for future in futures:
+            future.result()
+        executor_time = perf_counter() - start
+
+    print(
+        f"WorkStealingPool={pool_time:.4f}s, "
+        f"ThreadPoolExecutor={executor_time:.4f}s, "
+        f"steals={sum(stats['steals'])}, overflowed={stats['overflowed']}"
+    )